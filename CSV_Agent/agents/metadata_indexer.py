@@ -28,6 +28,10 @@ class MetadataIndexerAgent:
         self.chroma_clients = {}
         self.collections = {}
         
+        # Optional function mapping a query to its embedding (e.g. through a
+        # cache); when unset, ChromaDB embeds the query text itself
+        self.query_embedder = None
+        
     def _get_user_collection(self, user_id):
         """Get or create a user-specific ChromaDB collection"""
         if user_id in self.collections:
@@ -290,24 +294,9 @@ class MetadataIndexerAgent:
         # Get the collection for this user
         collection = self._get_user_collection(user_id)
         
-        # Create document ID from user_id and table_name
-        document_id = f"{table_name}_{user_id}"
-        
-        # Create document text representation
-        column_names = ", ".join(columns.keys())
-        document_text = f"Table {table_name} with columns {column_names}"
-        
-        # Create metadata for document - ensure all values are primitive types
-        metadata = {
-            "user_id": user_id,
-            "table_name": table_name,
-            "columns_list": ",".join(list(columns.keys())),  # Convert list to string
-        }
-        
-        # Add column descriptions as individual metadata fields
-        for col_name, col_desc in columns.items():
-            safe_col_name = f"col_{col_name.replace(' ', '_').replace('.', '_')}"
-            metadata[safe_col_name] = str(col_desc)  # Ensure value is string
+        document_id, document_text, metadata = self._build_metadata_document(
+            user_id, table_name, columns
+        )
         
         # Check if document already exists
         try:
@@ -347,6 +336,71 @@ class MetadataIndexerAgent:
         
         return document_id
     
+    def save_metadata_batch(self, user_id: str, entries: List[Dict[str, Any]]) -> List[str]:
+        """
+        Save metadata for several tables to the user's ChromaDB collection in one write.
+        
+        Args:
+            user_id: User identifier
+            entries: List of dictionaries with "table_name" and "columns" keys
+            
+        Returns:
+            List of document IDs of the saved metadata
+        """
+        if not entries:
+            return []
+        
+        # Get the collection for this user
+        collection = self._get_user_collection(user_id)
+        
+        ids, documents, metadatas = [], [], []
+        for entry in entries:
+            document_id, document_text, metadata = self._build_metadata_document(
+                user_id, entry["table_name"], entry.get("columns", {})
+            )
+            ids.append(document_id)
+            documents.append(document_text)
+            metadatas.append(metadata)
+        
+        # Upsert so re-initialization overwrites existing documents in the same call
+        collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+        
+        return ids
+    
+    def _build_metadata_document(self, user_id: str, table_name: str,
+                                 columns: Dict[str, str]) -> Tuple[str, str, Dict[str, str]]:
+        """
+        Build the ChromaDB document ID, text and metadata for a table.
+        
+        Args:
+            user_id: User identifier
+            table_name: Name of the table
+            columns: Dictionary of column names and descriptions
+            
+        Returns:
+            Tuple of (document_id, document_text, metadata)
+        """
+        # Create document ID from user_id and table_name
+        document_id = f"{table_name}_{user_id}"
+        
+        # Create document text representation
+        column_names = ", ".join(columns.keys())
+        document_text = f"Table {table_name} with columns {column_names}"
+        
+        # Create metadata for document - ensure all values are primitive types
+        metadata = {
+            "user_id": user_id,
+            "table_name": table_name,
+            "columns_list": ",".join(list(columns.keys())),  # Convert list to string
+        }
+        
+        # Add column descriptions as individual metadata fields
+        for col_name, col_desc in columns.items():
+            safe_col_name = f"col_{col_name.replace(' ', '_').replace('.', '_')}"
+            metadata[safe_col_name] = str(col_desc)  # Ensure value is string
+        
+        return document_id, document_text, metadata
+    
     def search_relevant_metadata(self, user_id: str, query_text: str) -> Optional[Dict[str, Any]]:
         """
         Search for relevant table metadata based on a user query.
@@ -362,9 +416,20 @@ class MetadataIndexerAgent:
             # Get the collection for this user
             collection = self._get_user_collection(user_id)
             
+            # With a single table there is nothing to rank: fetch it directly
+            # instead of embedding the query and running a nearest-neighbour search
+            if collection.count() == 1:
+                single = collection.get(where={"user_id": user_id}, limit=1, include=["metadatas"])
+                if single['ids']:
+                    return self._relevant_metadata(user_id, single['ids'][0], single['metadatas'][0])
+            
             # Query ChromaDB for relevant documents
+            if self.query_embedder is not None:
+                query = {"query_embeddings": [self.query_embedder(query_text)]}
+            else:
+                query = {"query_texts": [query_text]}
             results = collection.query(
-                query_texts=[query_text],
+                **query,
                 n_results=1,
                 where={"user_id": user_id}
             )
@@ -374,46 +439,48 @@ class MetadataIndexerAgent:
                 return None
             
             # Get the most relevant metadata
-            document_id = results['ids'][0][0]
-            chroma_metadata = results['metadatas'][0][0]
-            
-            # Extract column information from metadata
-            columns = []
-            column_descriptions = {}
-            
-            # Process metadata keys to find column information
-            for key, value in chroma_metadata.items():
-                if key.startswith('col_'):
-                    # Extract original column name by removing the 'col_' prefix
-                    col_name = key[4:].replace('_', ' ')
-                    columns.append(col_name)
-                    column_descriptions[col_name] = value
-            
-            # If no columns were found but we have columns_list
-            if not columns and 'columns_list' in chroma_metadata:
-                columns = chroma_metadata['columns_list'].split(',')
-                for col in columns:
-                    column_descriptions[col] = col.replace('_', ' ').title()
-            
-            # Extract base table name from metadata
-            base_table_name = chroma_metadata.get("table_name")
-            
-            # Construct full table name with user_id suffix
-            # PostgreSQL tables are stored as tablename_userid, but metadata may only have the base name
-            full_table_name = f"{base_table_name}_{user_id}" if base_table_name else None
-            
-            return {
-                "document_id": document_id,
-                "table_name": full_table_name,  # Return full table name with user_id
-                "base_table_name": base_table_name,  # Keep base name for reference
-                "columns": columns,
-                "column_descriptions": column_descriptions
-            }
+            return self._relevant_metadata(user_id, results['ids'][0][0], results['metadatas'][0][0])
             
         except Exception as e:
             print(f"Error searching relevant metadata: {e}")
             return None
     
+    def _relevant_metadata(self, user_id: str, document_id: str,
+                           chroma_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the relevant-metadata result from a table's ChromaDB document."""
+        # Extract column information from metadata
+        columns = []
+        column_descriptions = {}
+        
+        # Process metadata keys to find column information
+        for key, value in chroma_metadata.items():
+            if key.startswith('col_'):
+                # Extract original column name by removing the 'col_' prefix
+                col_name = key[4:].replace('_', ' ')
+                columns.append(col_name)
+                column_descriptions[col_name] = value
+        
+        # If no columns were found but we have columns_list
+        if not columns and 'columns_list' in chroma_metadata:
+            columns = chroma_metadata['columns_list'].split(',')
+            for col in columns:
+                column_descriptions[col] = col.replace('_', ' ').title()
+        
+        # Extract base table name from metadata
+        base_table_name = chroma_metadata.get("table_name")
+        
+        # Construct full table name with user_id suffix
+        # PostgreSQL tables are stored as tablename_userid, but metadata may only have the base name
+        full_table_name = f"{base_table_name}_{user_id}" if base_table_name else None
+        
+        return {
+            "document_id": document_id,
+            "table_name": full_table_name,  # Return full table name with user_id
+            "base_table_name": base_table_name,  # Keep base name for reference
+            "columns": columns,
+            "column_descriptions": column_descriptions
+        }
+    
     def list_user_tables(self, user_id: str) -> List[Dict[str, Any]]:
         """
         List all tables registered for a specific user.
@@ -1,3 +1,4 @@
+import io
 import os
 import pandas as pd
 import sqlalchemy
@@ -6,6 +7,13 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.sql import select
 from typing import Dict, List, Any, Optional, Tuple
 from models.data_models import QueryContext, AgentResponse
+from core.identifiers import safe_user_id, user_table_name
+
+# Rows serialized per COPY chunk, bounding the CSV buffer held in memory
+COPY_CHUNK_ROWS = 50000
+
+# Bytes sent per write when streaming a chunk to COPY
+COPY_BLOCK_SIZE = 1 << 20
 
 class PostgresHandlerAgent:
     """
@@ -113,6 +121,12 @@ class PostgresHandlerAgent:
             Tuple of (success, message, actual_table_name)
         """
         try:
+            # The user_id becomes part of the table name, so reject it before loading anything
+            try:
+                safe_user_id(user_id)
+            except ValueError as e:
+                return False, str(e), ""
+            
             # Read CSV file
             df = pd.read_csv(csv_path, low_memory=False)
             
@@ -129,10 +143,9 @@ class PostgresHandlerAgent:
             # Clean table name - ensure it's valid for PostgreSQL
             table_name = self._clean_table_name(table_name)
             
-            # Add user_id prefix to ensure uniqueness
-            qualified_table_name = f"{table_name}_{user_id}"
-            # Truncate if needed (PostgreSQL has a 63 character limit on identifiers)
-            qualified_table_name = qualified_table_name[:63]
+            # Add user_id suffix to ensure uniqueness, within PostgreSQL's
+            # 63 character limit on identifiers
+            qualified_table_name = user_table_name(table_name, user_id)
             
             # Create user_id column and add it to the DataFrame
             df.insert(0, 'user_id', user_id)
@@ -146,16 +159,27 @@ class PostgresHandlerAgent:
                     conn.execute(text(f'DROP TABLE IF EXISTS "{self.schema}"."{qualified_table_name}"'))
                     conn.commit()
                 
-                # Create the table and insert data
-                df.to_sql(
+                # Create the table from pandas' inferred types, then stream the
+                # parsed rows with COPY; fall back to batched INSERTs if COPY
+                # isn't available
+                df.head(0).to_sql(
                     qualified_table_name,
                     conn,
                     schema=self.schema,
                     if_exists='replace',
-                    index=False,
-                    method='multi',
-                    chunksize=1000
+                    index=False
                 )
+                conn.commit()
+                if not self._copy_dataframe(df, qualified_table_name):
+                    df.to_sql(
+                        qualified_table_name,
+                        conn,
+                        schema=self.schema,
+                        if_exists='replace',
+                        index=False,
+                        method='multi',
+                        chunksize=1000
+                    )
                 
                 # Add a primary key or index on user_id for better performance
                 try:
@@ -172,6 +196,52 @@ class PostgresHandlerAgent:
             print(f"Error creating/populating table: {e}")
             return False, str(e), ""
     
+    def _copy_dataframe(self, df: pd.DataFrame, table_name: str) -> bool:
+        """
+        Load a DataFrame into an existing table with COPY FROM STDIN.
+        
+        Rows are written as CSV from the parsed DataFrame, so NA, N/A, null
+        and empty fields become NULL exactly as pandas read them, without
+        binding each value in Python.
+        
+        Args:
+            df: Parsed data, including the user_id column
+            table_name: Qualified name of the table to load
+            
+        Returns:
+            True if the data was loaded, False if the caller should fall back
+        """
+        table = f'"{self.schema}"."{table_name}"'
+        cols = ", ".join('"{}"'.format(str(col).replace('"', '""')) for col in df.columns)
+        copy_sql = f"COPY {table} ({cols}) FROM STDIN WITH (FORMAT CSV)"
+        
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            if not hasattr(cursor, 'copy_expert') and not hasattr(cursor, 'copy'):
+                return False
+            
+            # Missing values are written as unquoted empty fields, which COPY reads as NULL
+            for start in range(0, len(df), COPY_CHUNK_ROWS):
+                buf = io.StringIO()
+                df.iloc[start:start + COPY_CHUNK_ROWS].to_csv(buf, header=False, index=False)
+                buf.seek(0)
+                if hasattr(cursor, 'copy_expert'):
+                    # psycopg2
+                    cursor.copy_expert(copy_sql, buf, size=COPY_BLOCK_SIZE)
+                else:
+                    # psycopg 3
+                    with cursor.copy(copy_sql) as copy:
+                        copy.write(buf.getvalue())
+            raw_conn.commit()
+            return True
+        except Exception as e:
+            raw_conn.rollback()
+            print(f"COPY failed, falling back to INSERT: {e}")
+            return False
+        finally:
+            raw_conn.close()
+    
     def ensure_user_filter_in_query(self, query: str, user_id: str, table_name: str) -> str:
         """
         Previously ensured the SQL query includes a filter for user_id.
@@ -247,7 +317,7 @@ class PostgresHandlerAgent:
         """Clean table name for PostgreSQL compatibility"""
         # Remove any characters that aren't alphanumeric or underscore
         import re
-        table_name = re.sub(r'[^\w]', '_', table_name)
+        table_name = re.sub(r'[^A-Za-z0-9_]', '_', table_name)
         # Ensure it starts with a letter
         if not table_name[0].isalpha():
             table_name = f"t_{table_name}"
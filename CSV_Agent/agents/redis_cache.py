@@ -117,9 +117,15 @@ class RedisCacheAgent:
             # Include query results if available
             if hasattr(context, 'query_results') and context.query_results is not None:
                 try:
-                    if not context.query_results.empty:
-                        cache_entry["query_results"] = context.query_results.to_dict('records')
-                        cache_entry["row_count"] = len(context.query_results)
+                    results = context.query_results
+                    if isinstance(results, dict):
+                        # Plain dict of columns, e.g. {"count": [150]}
+                        records = [dict(zip(results, row)) for row in zip(*results.values())]
+                    else:
+                        records = results.to_dict('records')
+                    if records:
+                        cache_entry["query_results"] = records
+                        cache_entry["row_count"] = len(records)
                 except:
                     pass
             
@@ -0,0 +1,102 @@
+"""
+SQL identifier rules shared by table creation (PostgresHandlerAgent) and the
+MCP server's list/delete/info helpers, so both always agree on table names.
+"""
+
+import hashlib
+import re
+
+# PostgreSQL truncates identifiers longer than this many bytes
+MAX_IDENT_LENGTH = 63
+
+# Longest user_id accepted; leaves room for a base name and hash in table names
+MAX_USER_ID_LENGTH = 40
+
+IDENT_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]{0,62}")
+
+# Base table names may be long; user_table_name shortens them
+TABLE_BASE_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# user_id is only ever a suffix, so it may start with a digit
+USER_ID_PATTERN = re.compile(r"[A-Za-z0-9_]{1,%d}" % MAX_USER_ID_LENGTH)
+
+
+def safe_ident(name: str) -> str:
+    """
+    Validate a schema or table identifier.
+
+    Args:
+        name: Identifier to check
+
+    Returns:
+        The identifier, unchanged
+
+    Raises:
+        ValueError: If the name is not a plain identifier of at most 63 characters
+    """
+    if not isinstance(name, str) or not IDENT_PATTERN.fullmatch(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return name
+
+
+def safe_user_id(user_id: str) -> str:
+    """
+    Validate a user identifier used as a table name suffix.
+
+    Args:
+        user_id: User identifier to check
+
+    Returns:
+        The user identifier, unchanged
+
+    Raises:
+        ValueError: If it has characters other than letters, digits and
+            underscores, or is longer than MAX_USER_ID_LENGTH
+    """
+    if not isinstance(user_id, str) or not USER_ID_PATTERN.fullmatch(user_id):
+        raise ValueError(
+            f"Invalid user ID {user_id!r}: use letters, digits and underscores "
+            f"(at most {MAX_USER_ID_LENGTH} characters)"
+        )
+    return user_id
+
+
+def user_table_name(table_name: str, user_id: str) -> str:
+    """
+    Build the PostgreSQL table name for a user's table.
+
+    Names over the length limit get a short hash of the base name instead of
+    being cut off, so two long names cannot collide and the user_id suffix
+    (used to list a user's tables) is always kept.
+
+    Args:
+        table_name: Base table name (without user_id suffix)
+        user_id: User identifier
+
+    Returns:
+        Table name of at most 63 characters ending in _<user_id>
+
+    Raises:
+        ValueError: If the table name or user_id is invalid
+    """
+    if not isinstance(table_name, str) or not TABLE_BASE_PATTERN.fullmatch(table_name):
+        raise ValueError(f"Invalid table name: {table_name!r}")
+    safe_user_id(user_id)
+
+    qualified = f"{table_name}_{user_id}"
+    if len(qualified) <= MAX_IDENT_LENGTH:
+        return qualified
+
+    digest = hashlib.sha1(table_name.encode("utf-8")).hexdigest()[:6]
+    keep = MAX_IDENT_LENGTH - len(user_id) - len(digest) - 2
+    return f"{table_name[:keep]}_{digest}_{user_id}"
+
+
+def legacy_table_name(table_name: str, user_id: str) -> str:
+    """
+    Name older versions gave a user's table: cut off at 63 characters.
+
+    Only differs from user_table_name for long names; lookups try it second
+    so tables created before hash-shortening can still be found and deleted.
+    """
+    return f"{table_name}_{user_id}"[:MAX_IDENT_LENGTH]
@@ -5,17 +5,22 @@ import importlib
 class TextSQLOrchestrator:
     """Main orchestrator that coordinates the agent workflow"""
     
-    def __init__(self, config_path: str):
-        """Initialize the orchestrator with configuration"""
-        self.config = self._load_config(config_path)
+    def __init__(self, config_path: str = None, config: Optional[Dict[str, Any]] = None):
+        """Initialize the orchestrator from a config file or an already-parsed config dict"""
+        self.config = config if config is not None else self._load_config(config_path)
         self.agents = {}
         self._load_agents()
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from JSON file"""
-        import json
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        from pathlib import Path
+        data = Path(config_path).read_bytes()
+        try:
+            import orjson
+        except ImportError:
+            import json
+            return json.loads(data)
+        return orjson.loads(data)
         
     def _load_agents(self):
         """Dynamically load all required agents based on configuration"""
@@ -30,6 +35,46 @@ class TextSQLOrchestrator:
             # Initialize agent with its config
             self.agents[agent_id] = agent_class(**agent_config.get('params', {}))
     
+    def warmup(self):
+        """
+        Build shared clients up front so the first query doesn't pay for them.
+        
+        Agents on the same database share one connection pool (duplicate
+        engines are disposed), which gets an open connection, and every
+        configured LLM is loaded into Ollama.
+        Each step is best-effort; failures are reported and skipped.
+        """
+        # Share one engine (and connection pool) between agents using the same database
+        engines = {}
+        for agent in self.agents.values():
+            engine = getattr(agent, 'engine', None)
+            if engine is not None:
+                shared = engines.setdefault(engine.url.render_as_string(hide_password=False), engine)
+                if shared is not engine:
+                    # Close the duplicate's pool; the agent keeps the shared engine from now on
+                    engine.dispose()
+                    agent.engine = shared
+        
+        for engine in engines.values():
+            try:
+                with engine.connect():
+                    pass
+            except Exception as e:
+                print(f"Warmup: could not connect to {engine.url}: {e}")
+        
+        # An empty prompt makes Ollama load the model without generating anything
+        models = {getattr(agent, 'llm_model', None) for agent in self.agents.values()} - {None}
+        if models:
+            try:
+                import ollama
+            except ImportError:
+                return
+            for model in sorted(models):
+                try:
+                    ollama.generate(model=model, prompt="")
+                except Exception as e:
+                    print(f"Warmup: could not load model {model}: {e}")
+    
     def process_query(self, user_question: str, db_name: str, table_name: str, 
                      user_id: str = None, force_visualization: bool = False) -> QueryContext:
         """Process a natural language query through the agent pipeline"""
@@ -1,8 +1,13 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Dict, List, Any, Optional
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
+
+if TYPE_CHECKING:
+    # Only needed for annotations; avoids importing pandas with the models
+    import pandas as pd
 
-@dataclass
+@dataclass(slots=True)
 class QueryContext:
     """Main data structure passed between agents"""
     user_question: str
@@ -19,8 +24,12 @@ class QueryContext:
     visualization_data: Dict[str, Any] = None
     needs_visualization: bool = False
     cache_hit: bool = False
+    # Set by the orchestrator/agents during processing (slots require declaring them)
+    csv_file: str = None
+    relevant_metadata: Dict[str, Any] = None
+    dataframe: Optional[pd.DataFrame] = None
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse:
     """Standard response format for all agents"""
     success: bool
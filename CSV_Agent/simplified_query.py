@@ -4,12 +4,35 @@ Simplified query script for the integrated PDF/Image to SQL system.
 This script doesn't rely on LLMs for query processing.
 """
 import os
+import json
+import hashlib
 import sys
 import sqlite3
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import chain, groupby
+from operator import itemgetter
 import pandas as pd
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+try:
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+except ImportError:
+    adbc_sqlite = None
+
+from utils.csv_retriever import arrow_convert_options
+
 # Define paths
 ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
 DATA_DIR = ROOT_DIR / "data"
@@ -18,116 +41,455 @@ CSV_OUTPUT_DIR = DATA_DIR / "csv_output"
 DB_STORAGE_DIR = DATA_DIR / "db_storage"
 CONVERSION_TOOL_DIR = ROOT_DIR / "conversion_tool"
 
+# Set once the directories above have been created
+_DIRS_OK = False
+
+# Image extensions handed to the conversion tool alongside PDFs
+IMAGE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'tiff', 'bmp'})
+
+# Column name cleanup: separators become underscores, punctuation is dropped
+_COL_TRANS = str.maketrans({' ': '_', '\n': '_', '/': '_', ',': None, '(': None, ')': None})
+
 # Default database settings
 DEFAULT_DB_NAME = "query_data.db"
 DEFAULT_TABLE_NAME = "extracted_data"
 
+# File in DATA_DIR holding the input hash of the last successful processing run
+LAST_PROCESS_HASH_FILE = ".last_process.hash"
+
+# Sidecar in DB_STORAGE_DIR recording which CSV files have been ingested
+INGEST_STATE_FILE = "ingest_state.json"
+
+# Bulk insert settings: rows packed into one INSERT statement, capped so the
+# bound parameters stay under SQLite's default SQLITE_MAX_VARIABLE_NUMBER
+ROWS_PER_INSERT = 64
+SQLITE_MAX_VARIABLES = 999
+
+# Largest range handed to a single os.copy_file_range call
+COPY_CHUNK_SIZE = 1 << 30
+
+# Path of a compiled SQLite csv virtual table extension (ext/misc/csv.c); when
+# set, CSV files are loaded by SQLite directly instead of parsed in Python
+SQLITE_CSV_EXTENSION = os.environ.get("SQLITE_CSV_EXTENSION")
+
+# Seconds between scans for CSVs written by the running conversion tool
+CSV_POLL_INTERVAL = 0.5
+
+# Shared connections reused across execute_query calls (sqlite3, or ADBC when
+# adbc_driver_sqlite is installed), and the number of prepared statements the
+# sqlite3 connection keeps
+_CONN = None
+_ADBC_CONN = None
+STATEMENT_CACHE_SIZE = 256
+
+def _ensure_dirs():
+    """Create the data and conversion tool directories, once per process"""
+    global _DIRS_OK
+    if _DIRS_OK:
+        return
+    for path in (INPUT_DIR, CSV_OUTPUT_DIR, DB_STORAGE_DIR, CONVERSION_TOOL_DIR / "pdfs"):
+        os.makedirs(path, exist_ok=True)
+    _DIRS_OK = True
+
+def _fast_copy(source, target):
+    """Copy a file inside the kernel with os.copy_file_range, falling back to shutil.copyfile"""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                # Reflinked on btrfs/xfs, server-side on NFS 4.2
+                while os.copy_file_range(src.fileno(), dst.fileno(), COPY_CHUNK_SIZE):
+                    pass
+            return
+        except OSError:
+            # Unsupported kernel or filesystem pair (e.g. ENOSYS, EXDEV)
+            pass
+    shutil.copyfile(source, target)
+
+def _copy_files(jobs):
+    """Copy (source, target) pairs on a thread pool; returns the number of files copied"""
+    if not jobs:
+        return 0
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(jobs))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda job: _fast_copy(*job), jobs))
+    return len(jobs)
+
+def _copy_new_csvs(source_dir, copied):
+    """Copy CSVs in source_dir that are new or changed since the last call; returns the number copied"""
+    jobs = []
+    try:
+        with os.scandir(source_dir) as entries:
+            for entry in entries:
+                if not (entry.name.endswith(".csv") and entry.is_file()):
+                    continue
+                stat = entry.stat()
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if copied.get(entry.name) != signature:
+                    copied[entry.name] = signature
+                    jobs.append((entry.path, CSV_OUTPUT_DIR / entry.name))
+    except FileNotFoundError:
+        return 0
+    return _copy_files(jobs)
+
+def _input_files_hash(entries):
+    """Hash the names, sizes and modification times of the given directory entries"""
+    signatures = []
+    for entry in entries:
+        stat = entry.stat()
+        signatures.append(f"{entry.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n")
+    
+    # Sort so the hash doesn't depend on directory order
+    digest = hashlib.blake2b(digest_size=16)
+    for signature in sorted(signatures):
+        digest.update(signature.encode())
+    return digest.hexdigest()
+
 def process_input_files():
     """Process PDF/image files in the input directory"""
-    # Check if there are files to process
-    pdf_files = list(INPUT_DIR.glob("*.pdf"))
-    image_files = []
-    for ext in ["*.png", "*.jpg", "*.jpeg", "*.tiff", "*.bmp"]:
-        image_files.extend(list(INPUT_DIR.glob(ext)))
+    _ensure_dirs()
     
-    # Check for CSV files (for direct ingestion)
-    csv_files = list(INPUT_DIR.glob("*.csv"))
+    # Sort input files by extension in a single directory pass; CSV files
+    # are ingested directly
+    pdf_files, image_files, csv_files = [], [], []
+    with os.scandir(INPUT_DIR) as entries:
+        for entry in entries:
+            extension = entry.name.rpartition('.')[2].lower()
+            if extension == 'pdf':
+                pdf_files.append(entry)
+            elif extension in IMAGE_EXTENSIONS:
+                image_files.append(entry)
+            elif extension == 'csv':
+                csv_files.append(entry)
     
     if not (pdf_files or image_files or csv_files):
         print("No PDF, image, or CSV files found in input directory.")
         return False
     
-    print(f"Found {len(pdf_files)} PDF files, {len(image_files)} image files, and {len(csv_files)} CSV files.")
+    # Skip the copy/conversion work if the inputs match the last successful run
+    input_hash = _input_files_hash(pdf_files + image_files + csv_files)
+    hash_path = DATA_DIR / LAST_PROCESS_HASH_FILE
+    try:
+        if hash_path.read_text() == input_hash:
+            print("Input files unchanged since the last run; skipping processing.")
+            return True
+    except OSError:
+        pass
     
-    # Step 1: Ensure directories exist
-    INPUT_DIR.mkdir(parents=True, exist_ok=True)
-    CSV_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    DB_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
-    (CONVERSION_TOOL_DIR / "pdfs").mkdir(exist_ok=True)
+    print(f"Found {len(pdf_files)} PDF files, {len(image_files)} image files, and {len(csv_files)} CSV files.")
     
     # Handle PDF/image files through conversion_tool
     if pdf_files or image_files:
         # Step 2: Copy files to conversion_tool/pdfs
         print("\nStep 1: Copying files to conversion tool...")
-        for pdf_file in pdf_files:
-            target_path = CONVERSION_TOOL_DIR / "pdfs" / pdf_file.name
-            with open(pdf_file, 'rb') as src, open(target_path, 'wb') as dst:
-                dst.write(src.read())
-            print(f"Copied {pdf_file.name} to conversion tool")
-        
-        for img_file in image_files:
-            target_path = CONVERSION_TOOL_DIR / "pdfs" / img_file.name
-            with open(img_file, 'rb') as src, open(target_path, 'wb') as dst:
-                dst.write(src.read())
-            print(f"Copied {img_file.name} to conversion tool")
+        copied = _copy_files([(source, CONVERSION_TOOL_DIR / "pdfs" / source.name)
+                              for source in pdf_files + image_files])
+        print(f"Copied {copied} files to conversion tool")
         
-        # Step 3: Run the conversion tool
+        # Step 3: Run the conversion tool, copying CSVs out as it writes them
         print("\nStep 2: Converting files to CSV...")
         python_executable = sys.executable
+        csv_source_dir = CONVERSION_TOOL_DIR / "csv_output"
+        copied_csvs = {}
         
-        conversion_result = subprocess.run(
-            [python_executable, "main.py"],
-            cwd=str(CONVERSION_TOOL_DIR),
-            capture_output=True,
-            text=True
-        )
-        
-        if conversion_result.returncode != 0:
-            print("Error running conversion tool:")
-            print(conversion_result.stderr)
-            return False
+        with tempfile.TemporaryFile(mode='w+') as stderr_file:
+            process = subprocess.Popen(
+                [python_executable, "main.py"],
+                cwd=str(CONVERSION_TOOL_DIR),
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
+                bufsize=1
+            )
+            
+            def copy_while_converting():
+                while process.poll() is None:
+                    _copy_new_csvs(csv_source_dir, copied_csvs)
+                    time.sleep(CSV_POLL_INTERVAL)
+            
+            watcher = threading.Thread(target=copy_while_converting, daemon=True)
+            watcher.start()
+            for line in process.stdout:
+                print(line, end="")
+            returncode = process.wait()
+            watcher.join()
+            
+            if returncode != 0:
+                stderr_file.seek(0)
+                print("Error running conversion tool:")
+                print(stderr_file.read())
+                return False
         
         print("Conversion completed successfully")
         
-        # Step 4: Copy CSV files to output directory
+        # Step 4: Copy any CSV files written or changed since the last poll
         print("\nStep 3: Copying CSV files to output directory...")
-        conversion_csv_files = list((CONVERSION_TOOL_DIR / "csv_output").glob("*.csv"))
-        
-        for csv_file in conversion_csv_files:
-            target_path = CSV_OUTPUT_DIR / csv_file.name
-            with open(csv_file, 'rb') as src, open(target_path, 'wb') as dst:
-                dst.write(src.read())
-            print(f"Copied {csv_file.name} to output directory")
+        _copy_new_csvs(csv_source_dir, copied_csvs)
+        print(f"Copied {len(copied_csvs)} CSV files to output directory")
     
     # Handle direct CSV files
     if csv_files:
         print("\nStep 4: Copying direct CSV files to output directory...")
-        for csv_file in csv_files:
-            target_path = CSV_OUTPUT_DIR / csv_file.name
-            with open(csv_file, 'rb') as src, open(target_path, 'wb') as dst:
-                dst.write(src.read())
-            print(f"Copied {csv_file.name} to output directory")
+        copied = _copy_files([(csv_file, CSV_OUTPUT_DIR / csv_file.name) for csv_file in csv_files])
+        print(f"Copied {copied} CSV files to output directory")
     
+    hash_path.write_text(input_hash)
     return True
 
+def _clean_column_name(col):
+    """Clean a CSV column name for use as an SQLite column"""
+    return col.lower().translate(_COL_TRANS)
+
+def _sqlite_type(arrow_type):
+    """Map an Arrow column type to the SQLite type pandas.to_sql would have used"""
+    if pa.types.is_integer(arrow_type) or pa.types.is_boolean(arrow_type):
+        return "INTEGER"
+    if pa.types.is_floating(arrow_type):
+        return "REAL"
+    if pa.types.is_timestamp(arrow_type) or pa.types.is_date(arrow_type):
+        return "TIMESTAMP"
+    return "TEXT"
+
+def _sqlite_values(column):
+    """Python values of an Arrow column in a form sqlite3 can bind
+    
+    Numbers, booleans, strings and bytes bind as they are. Timestamps and dates
+    are stored as text the way pandas.to_sql writes them; any other type
+    (times, decimals, durations) is stored as Arrow's text form.
+    """
+    arrow_type = column.type
+    if (pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type)
+            or pa.types.is_boolean(arrow_type) or pa.types.is_string(arrow_type)
+            or pa.types.is_large_string(arrow_type) or pa.types.is_binary(arrow_type)
+            or pa.types.is_null(arrow_type)):
+        return column.to_pylist()
+    if pa.types.is_timestamp(arrow_type) or pa.types.is_date(arrow_type):
+        return [None if value is None else str(value) for value in column.to_pylist()]
+    return column.cast(pa.string()).to_pylist()
+
+def _parse_csv(csv_file):
+    """Read a CSV file and clean its column names; runs in a worker process
+    
+    Returns (table_name, data), where data is a PyArrow table when pyarrow is
+    installed and a pandas DataFrame otherwise.
+    """
+    if pacsv is not None:
+        # Dates and times stay text, as in the pandas fallback below
+        table = pacsv.read_csv(
+            str(csv_file),
+            read_options=pacsv.ReadOptions(block_size=8 << 20, use_threads=True),
+            convert_options=arrow_convert_options(str(csv_file))
+        )
+        return csv_file.stem, table.rename_columns(
+            [_clean_column_name(name) for name in table.column_names]
+        )
+    
+    df = pd.read_csv(csv_file)
+    df.columns = [_clean_column_name(col) for col in df.columns]
+    return csv_file.stem, df
+
+def _write_arrow_table(conn, table_name, table):
+    """Replace an SQLite table with the contents of a PyArrow table; returns the row count"""
+    column_defs = ", ".join(
+        f"{_quote_identifier(field.name)} {_sqlite_type(field.type)}" for field in table.schema
+    )
+    conn.execute(f"DROP TABLE IF EXISTS {_quote_identifier(table_name)}")
+    conn.execute(f"CREATE TABLE {_quote_identifier(table_name)} ({column_defs})")
+    
+    for batch in table.to_batches(max_chunksize=65536):
+        rows = list(zip(*(_sqlite_values(column) for column in batch.columns)))
+        _insert_rows(conn, table_name, table.num_columns, rows)
+    return table.num_rows
+
+def _iter_parsed_csvs(csv_files):
+    """Yield (table_name, data) for each CSV file, parsing files in parallel processes"""
+    if len(csv_files) == 1:
+        yield _parse_csv(csv_files[0])
+        return
+    
+    max_workers = min(len(csv_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_parse_csv, csv_file) for csv_file in csv_files]
+        for future in as_completed(futures):
+            yield future.result()
+
+def _insert_rows(conn, table_name, column_count, rows):
+    """Insert rows using multi-row INSERT statements of up to ROWS_PER_INSERT rows each"""
+    rows_per_statement = max(1, min(ROWS_PER_INSERT, SQLITE_MAX_VARIABLES // column_count))
+    row_placeholder = f"({', '.join('?' * column_count)})"
+    quoted_table = _quote_identifier(table_name)
+    
+    def insert_sql(row_total):
+        return f'INSERT INTO {quoted_table} VALUES {", ".join([row_placeholder] * row_total)}'
+    
+    # Full-size groups share one prepared statement through executemany
+    full_rows = len(rows) - len(rows) % rows_per_statement
+    if full_rows:
+        conn.executemany(
+            insert_sql(rows_per_statement),
+            (tuple(chain.from_iterable(rows[i:i + rows_per_statement]))
+             for i in range(0, full_rows, rows_per_statement))
+        )
+    
+    # Remaining tail rows go in one smaller statement
+    tail = rows[full_rows:]
+    if tail:
+        conn.execute(insert_sql(len(tail)), tuple(chain.from_iterable(tail)))
+
+def _write_parsed_csvs(conn, csv_files):
+    """Write CSV files into SQLite as worker processes finish parsing them; yields (table_name, row_count)"""
+    for table_name, data in _iter_parsed_csvs(csv_files):
+        if pa is not None and isinstance(data, pa.Table):
+            row_count = _write_arrow_table(conn, table_name, data)
+        else:
+            row_count = _write_dataframe(conn, table_name, data)
+        yield table_name, row_count
+
+def _write_dataframe(conn, table_name, df):
+    """Replace an SQLite table with a DataFrame's rows; returns the row count"""
+    # DataFrame.to_sql commits on a sqlite3 connection, which would end the
+    # caller's transaction, so only borrow its CREATE TABLE statement
+    conn.execute(f"DROP TABLE IF EXISTS {_quote_identifier(table_name)}")
+    conn.execute(pd.io.sql.get_schema(df, table_name, con=conn))
+    
+    rows = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+    _insert_rows(conn, table_name, len(df.columns), rows)
+    return len(rows)
+
+def _load_csv_extension(conn):
+    """Load SQLite's csv virtual table extension if one is configured; returns True on success"""
+    if not SQLITE_CSV_EXTENSION:
+        return False
+    try:
+        conn.enable_load_extension(True)
+        conn.load_extension(SQLITE_CSV_EXTENSION)
+        return True
+    except (AttributeError, sqlite3.Error) as e:
+        # AttributeError: Python built without extension loading support
+        print(f"CSV extension unavailable, falling back to Python parsing: {str(e)}")
+        return False
+    finally:
+        if hasattr(conn, "enable_load_extension"):
+            conn.enable_load_extension(False)
+
+def _load_csv_with_extension(conn, csv_file, table_name):
+    """Copy a CSV file into an SQLite table through the csv virtual table; returns the row count
+    
+    Parsing and inserting both happen inside SQLite. The virtual table has no
+    type information, so every column is stored as TEXT.
+    """
+    filename = str(csv_file).replace("'", "''")
+    conn.execute(f"CREATE VIRTUAL TABLE temp.csv_import USING csv(filename='{filename}', header=YES)")
+    try:
+        header = [column[0] for column in conn.execute("SELECT * FROM temp.csv_import LIMIT 0").description]
+        select_list = ", ".join(
+            f"{_quote_identifier(name)} AS {_quote_identifier(_clean_column_name(name))}" for name in header
+        )
+        conn.execute(f"DROP TABLE IF EXISTS {_quote_identifier(table_name)}")
+        conn.execute(f"CREATE TABLE {_quote_identifier(table_name)} AS SELECT {select_list} FROM temp.csv_import")
+    finally:
+        conn.execute("DROP TABLE temp.csv_import")
+    return conn.execute(f"SELECT COUNT(*) FROM {_quote_identifier(table_name)}").fetchone()[0]
+
+def _configure_bulk_load(conn):
+    """Apply PRAGMAs that make bulk inserts cheaper on this connection"""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+
+def _file_digest(path):
+    """Return a short SHA-1 hex digest of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def _save_ingest_state(state):
+    """Write the ingest state sidecar next to the database"""
+    with open(DB_STORAGE_DIR / INGEST_STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2)
+
+def _find_changed_csvs(db_path):
+    """Find CSV files that changed since they were last ingested
+    
+    Returns (csv_files, state) where state maps each CSV path to its
+    [size, mtime_ns, digest]; csv_files is None when there are no CSVs at all.
+    Files are only hashed when their size or mtime differs from the stored one.
+    """
+    state_path = DB_STORAGE_DIR / INGEST_STATE_FILE
+    previous = {}
+    if db_path.exists() and state_path.exists():
+        try:
+            with open(state_path) as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = {}
+    
+    state, changed = {}, []
+    with os.scandir(CSV_OUTPUT_DIR) as entries:
+        for entry in entries:
+            if not (entry.name.endswith(".csv") and entry.is_file()):
+                continue
+            stat = entry.stat()
+            recorded = previous.get(entry.path)
+            if recorded and recorded[:2] == [stat.st_size, stat.st_mtime_ns]:
+                state[entry.path] = recorded
+                continue
+            
+            digest = _file_digest(entry.path)
+            state[entry.path] = [stat.st_size, stat.st_mtime_ns, digest]
+            if not (recorded and recorded[2] == digest):
+                changed.append(Path(entry.path))
+    
+    if not state:
+        return None, state
+    return changed, state
+
 def ingest_csv_to_database():
     """Ingest CSV files to SQLite database"""
     print("\nStep 4: Ingesting CSV files to database...")
     db_path = DB_STORAGE_DIR / DEFAULT_DB_NAME
     
-    csv_files = list(CSV_OUTPUT_DIR.glob("*.csv"))
-    if not csv_files:
+    csv_files, ingest_state = _find_changed_csvs(db_path)
+    if csv_files is None:
         print("No CSV files found in output directory.")
         return False
+    if not csv_files:
+        # Keep refreshed size/mtime values so touched files aren't rehashed
+        _save_ingest_state(ingest_state)
+        print("All CSV files are already ingested.")
+        return True
+    
+    # The bulk load takes an exclusive lock, so release the query connection
+    _close_conn()
     
     try:
-        for csv_file in csv_files:
-            table_name = csv_file.stem
-            print(f"Processing {csv_file.name}...")
-            
-            # Read CSV file
-            df = pd.read_csv(csv_file)
-            
-            # Clean column names
-            df.columns = [col.lower().replace(' ', '_').replace('\n', '_').replace('/', '_')
-                          .replace(',', '').replace('(', '').replace(')', '')
-                          for col in df.columns]
+        # One connection for the whole ingest, tuned for bulk writes
+        conn = sqlite3.connect(str(db_path))
+        try:
+            _configure_bulk_load(conn)
             
-            # Save to database
-            with sqlite3.connect(str(db_path)) as conn:
-                df.to_sql(table_name, conn, if_exists='replace', index=False)
+            # Single transaction: all tables are committed (and fsynced) once
+            with conn:
+                conn.execute("BEGIN")
+                print(f"Processing {', '.join(csv_file.name for csv_file in csv_files)}...")
+                
+                if _load_csv_extension(conn):
+                    # SQLite parses and inserts the files itself
+                    loaded = ((csv_file.stem, _load_csv_with_extension(conn, csv_file, csv_file.stem))
+                              for csv_file in csv_files)
+                else:
+                    loaded = _write_parsed_csvs(conn, csv_files)
                 
-            print(f"Successfully loaded {len(df)} rows into {db_path}, table {table_name}")
+                for table_name, row_count in loaded:
+                    print(f"Successfully loaded {row_count} rows into {db_path}, table {table_name}")
+        finally:
+            conn.close()
+        
+        # Only record the files once their transaction has committed
+        _save_ingest_state(ingest_state)
         
         return True
     
@@ -135,6 +497,10 @@ def ingest_csv_to_database():
         print(f"Error ingesting CSV files: {str(e)}")
         return False
 
+def _quote_identifier(name):
+    """Quote an SQLite identifier such as a table or column name"""
+    return '"' + name.replace('"', '""') + '"'
+
 def show_database_info():
     """Show information about the database"""
     db_path = DB_STORAGE_DIR / DEFAULT_DB_NAME
@@ -145,29 +511,37 @@ def show_database_info():
     
     try:
         with sqlite3.connect(str(db_path)) as conn:
-            # Get list of tables
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in cursor.fetchall()]
+            # Get every table's schema in one query via the table-valued pragma
+            schema_rows = conn.execute(
+                "SELECT m.name, p.name, p.type FROM sqlite_master m "
+                "JOIN pragma_table_info(m.name) p "
+                "WHERE m.type = 'table' ORDER BY m.name, p.cid"
+            ).fetchall()
+            schemas = {table: [(column, col_type) for _, column, col_type in rows]
+                       for table, rows in groupby(schema_rows, key=itemgetter(0))}
+            tables = list(schemas)
             
             print("\nDatabase Information:")
             print(f"Database: {db_path.name}")
             print(f"Tables: {', '.join(tables)}")
             
+            # Sample rows one table at a time: a plain SELECT * keeps BLOBs and
+            # wide tables intact and stays within SQLite's compound-select limit
+            samples = {
+                table: conn.execute(f"SELECT * FROM {_quote_identifier(table)} LIMIT 5").fetchall()
+                for table in tables
+            }
+            
             # Show schema for each table
             for table in tables:
                 print(f"\nTable: {table}")
                 
-                # Get schema
-                cursor.execute(f"PRAGMA table_info({table})")
-                columns = cursor.fetchall()
                 print("Schema:")
-                for col in columns:
-                    print(f"  - {col[1]} ({col[2]})")
+                for column, col_type in schemas[table]:
+                    print(f"  - {column} ({col_type})")
                 
                 # Show sample data
-                cursor.execute(f"SELECT * FROM {table} LIMIT 5")
-                rows = cursor.fetchall()
+                rows = samples[table]
                 
                 if rows:
                     print("\nSample Data:")
@@ -179,6 +553,55 @@ def show_database_info():
     except Exception as e:
         print(f"Error reading database: {str(e)}")
 
+def _get_conn():
+    """Return the shared query connection, opening it on first use"""
+    global _CONN
+    if _CONN is None:
+        # sqlite3 keeps compiled statements keyed by SQL text, so repeated
+        # queries skip the prepare step
+        _CONN = sqlite3.connect(
+            str(DB_STORAGE_DIR / DEFAULT_DB_NAME),
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        _CONN.execute("PRAGMA journal_mode=WAL")
+        _CONN.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    return _CONN
+
+def _close_conn():
+    """Close the shared query connections if they are open"""
+    global _CONN, _ADBC_CONN
+    if _CONN is not None:
+        _CONN.close()
+        _CONN = None
+    if _ADBC_CONN is not None:
+        _ADBC_CONN.close()
+        _ADBC_CONN = None
+
+def _execute_with_adbc(query):
+    """Run a query over ADBC, fetching the result directly as an Arrow table"""
+    global _ADBC_CONN
+    if _ADBC_CONN is None:
+        _ADBC_CONN = adbc_sqlite.connect(str(DB_STORAGE_DIR / DEFAULT_DB_NAME), autocommit=True)
+    
+    with _ADBC_CONN.cursor() as cursor:
+        cursor.execute(query)
+        if not cursor.description:
+            # Statement returned no rows (e.g. UPDATE)
+            return pd.DataFrame()
+        return cursor.fetch_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+
+def _rows_to_dataframe(columns, rows):
+    """Build a DataFrame from fetched rows, going through Arrow when it is available"""
+    if pa is not None:
+        try:
+            arrays = [pa.array(values) for values in zip(*rows)] if rows else [pa.array([]) for _ in columns]
+            return pa.Table.from_arrays(arrays, names=columns).to_pandas(types_mapper=pd.ArrowDtype)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # SQLite columns can mix types; let pandas infer those
+            pass
+    return pd.DataFrame.from_records(rows, columns=columns)
+
 def execute_query(query):
     """Execute an SQL query directly"""
     db_path = DB_STORAGE_DIR / DEFAULT_DB_NAME
@@ -188,9 +611,17 @@ def execute_query(query):
         return
     
     try:
-        with sqlite3.connect(str(db_path)) as conn:
-            result = pd.read_sql_query(query, conn)
-            return result
+        if adbc_sqlite is not None:
+            return _execute_with_adbc(query)
+        
+        conn = _get_conn()
+        cursor = conn.execute(query)
+        if cursor.description is None:
+            # Statement returned no rows (e.g. UPDATE); keep its changes
+            conn.commit()
+            return pd.DataFrame()
+        columns = [column[0] for column in cursor.description]
+        return _rows_to_dataframe(columns, cursor.fetchall())
     
     except Exception as e:
         print(f"Error executing query: {str(e)}")
@@ -199,9 +630,7 @@ def execute_query(query):
 def main():
     """Main function"""
     # Create directories if they don't exist
-    INPUT_DIR.mkdir(parents=True, exist_ok=True)
-    CSV_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    DB_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+    _ensure_dirs()
     
     # Check if we have arguments
     if len(sys.argv) < 2:
@@ -0,0 +1,153 @@
+"""
+Behavior tests for CSVRetriever's SQLite loading.
+Uses the pandas/sqlite3 path (any pandas option selects it), plus the
+in-memory metadata cache used by directory scans.
+"""
+import os
+import sqlite3
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the CSV_Agent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import csv_retriever
+from utils.csv_retriever import CSVRetriever
+
+
+@pytest.fixture
+def retriever(tmp_path):
+    return CSVRetriever(str(tmp_path))
+
+
+def write_csv(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def fetch(db_path, sql):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def test_chunked_load_commits_every_row(retriever, tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_retriever, "CHECKPOINT_ROWS", 2)
+    csv_path = write_csv(tmp_path / "sales.csv", "id,amount\n" + "".join(f"{i},{i * 1.5}\n" for i in range(7)))
+    db_path = str(tmp_path / "data.db")
+
+    ok, message = retriever.load_to_sqlite(csv_path, db_path, chunksize=3)
+
+    assert ok, message
+    assert fetch(db_path, "SELECT COUNT(*), SUM(id) FROM sales") == [(7, 21)]
+
+
+def test_failed_replace_keeps_old_table(retriever, tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_retriever, "CHECKPOINT_ROWS", 1)
+    db_path = str(tmp_path / "data.db")
+    good = write_csv(tmp_path / "good.csv", "id,name\n1,a\n2,b\n")
+    assert retriever.load_to_sqlite(good, db_path, table_name="t", chunksize=1)[0]
+
+    # Fail on the third chunk, after two checkpoints have committed
+    insert_rows = retriever._insert_rows
+    calls = []
+
+    def failing_insert(conn, df, table_name):
+        calls.append(table_name)
+        if len(calls) == 3:
+            raise sqlite3.OperationalError("disk I/O error")
+        insert_rows(conn, df, table_name)
+
+    monkeypatch.setattr(retriever, "_insert_rows", failing_insert)
+    new = write_csv(tmp_path / "new.csv", "id,name\n3,c\n4,d\n5,e\n")
+    ok, _ = retriever.load_to_sqlite(new, db_path, table_name="t", chunksize=1)
+
+    assert not ok
+    assert fetch(db_path, "SELECT id FROM t ORDER BY id") == [(1,), (2,)]
+    assert fetch(db_path, "SELECT name FROM sqlite_master WHERE type = 'table'") == [("t",)]
+
+
+def test_replace_swaps_in_new_rows(retriever, tmp_path):
+    db_path = str(tmp_path / "data.db")
+    first = write_csv(tmp_path / "first.csv", "id\n1\n2\n")
+    second = write_csv(tmp_path / "second.csv", "id\n9\n")
+    assert retriever.load_to_sqlite(first, db_path, table_name="t", chunksize=1)[0]
+    assert retriever.load_to_sqlite(second, db_path, table_name="t", chunksize=1)[0]
+
+    assert fetch(db_path, "SELECT id FROM t") == [(9,)]
+
+
+def test_indexes_built_after_load(retriever, tmp_path):
+    csv_path = write_csv(tmp_path / "orders.csv", "id,customer\n1,a\n2,b\n")
+    db_path = str(tmp_path / "data.db")
+
+    ok, message = retriever.load_to_sqlite(csv_path, db_path, indexes=[("customer", ["customer"])],
+                                           chunksize=1)
+
+    assert ok, message
+    assert fetch(db_path, "SELECT name FROM sqlite_master WHERE type = 'index'") == [("idx_orders_customer",)]
+
+
+def test_quotes_in_names_are_escaped(retriever, tmp_path):
+    csv_path = write_csv(tmp_path / "q.csv", 'id,"say ""hi"""\n1,x\n')
+    db_path = str(tmp_path / "data.db")
+
+    ok, message = retriever.load_to_sqlite(csv_path, db_path, table_name='my"table', clean_names=False,
+                                           indexes=[("say", ['say "hi"'])], chunksize=1)
+
+    assert ok, message
+    assert fetch(db_path, 'SELECT "say ""hi""" FROM "my""table"') == [("x",)]
+
+
+def test_load_csv_keeps_date_strings(retriever, tmp_path):
+    csv_path = write_csv(tmp_path / "events.csv", "day,at,opens,n\n2024-01-02,2024-01-02 03:04:05,09:30:00,1\n")
+
+    df = retriever.load_csv(csv_path)
+
+    assert df.iloc[0].tolist() == ["2024-01-02", "2024-01-02 03:04:05", "09:30:00", 1]
+    assert df.iloc[0].tolist() == pd.read_csv(csv_path).iloc[0].tolist()
+
+
+def test_read_connection_is_cached_and_read_only(retriever, tmp_path):
+    csv_path = write_csv(tmp_path / "people.csv", "id,name\n1,a\n2,b\n")
+    db_path = str(tmp_path / "data.db")
+    assert retriever.load_to_sqlite(csv_path, db_path, chunksize=1)[0]
+
+    assert retriever.list_tables(db_path) == ["people"]
+    assert retriever.get_schema(db_path, "people") == {"id": "INTEGER", "name": "TEXT"}
+    assert retriever.preview_table(db_path, "people", limit=1)["name"].tolist() == ["a"]
+
+    conn = retriever._conns[db_path]
+    assert retriever._conn(db_path) is conn
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM people")
+    retriever.close()
+
+
+def test_reload_closes_cached_reader(retriever, tmp_path):
+    db_path = str(tmp_path / "data.db")
+    first = write_csv(tmp_path / "t.csv", "id\n1\n")
+    assert retriever.load_to_sqlite(first, db_path, chunksize=1)[0]
+    assert retriever.list_tables(db_path) == ["t"]
+
+    second = write_csv(tmp_path / "t.csv", "id\n1\n2\n")
+    assert retriever.load_to_sqlite(second, db_path, chunksize=1)[0]
+
+    assert db_path not in retriever._conns
+    assert len(retriever.preview_table(db_path, "t")) == 2
+    retriever.close()
+
+
+def test_scan_caches_metadata_in_memory(retriever, tmp_path, monkeypatch):
+    keep = write_csv(tmp_path / "keep.csv", "id\n1\n")
+    gone = write_csv(tmp_path / "gone.csv", "id\n1\n")
+    retriever.scan_directory()
+
+    os.remove(gone)
+    monkeypatch.setattr(retriever, "_get_csv_metadata", lambda *args: pytest.fail("unchanged file re-read"))
+
+    assert list(retriever.scan_directory()) == [keep]
+    assert list(retriever._meta_cache) == [keep]
+    # Nothing is written into the data directory
+    assert sorted(os.listdir(tmp_path)) == ["keep.csv"]
@@ -0,0 +1,146 @@
+"""
+Behavior tests for DataFolderMonitor.
+Covers the ingest manifest, the seen-paths filter and the process-pool
+shard merge.
+"""
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add the CSV_Agent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import data_folder_monitor
+from utils.data_folder_monitor import DataFolderMonitor
+
+
+@pytest.fixture
+def folder(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    return data
+
+
+def make_monitor(folder, tmp_path):
+    return DataFolderMonitor(str(folder), str(tmp_path / "target.db"), table_name="loan_dt")
+
+
+def tables(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'"))
+
+
+def test_single_file_recorded_in_sidecar_manifest(folder, tmp_path):
+    (folder / "sales.csv").write_text("id,amount\n1,2.5\n")
+    monitor = make_monitor(folder, tmp_path)
+
+    assert monitor.process_all_files() == {str(folder / "sales.csv"): True}
+
+    # The manifest stays out of the target database
+    assert tables(monitor.db_name) == ["sales"]
+    assert os.path.exists(monitor.manifest_path)
+    assert monitor.get_unprocessed_files() == []
+
+
+def test_new_monitor_skips_recorded_files(folder, tmp_path):
+    (folder / "sales.csv").write_text("id\n1\n")
+    make_monitor(folder, tmp_path).process_all_files()
+
+    monitor = make_monitor(folder, tmp_path)
+    assert str(folder / "sales.csv") in monitor._seen_bloom
+    assert monitor.get_unprocessed_files() == []
+
+
+def test_changed_file_is_reprocessed(folder, tmp_path):
+    csv_file = folder / "sales.csv"
+    csv_file.write_text("id\n1\n")
+    monitor = make_monitor(folder, tmp_path)
+    monitor.process_all_files()
+
+    csv_file.write_text("id\n1\n2\n")
+    os.utime(csv_file, ns=(0, csv_file.stat().st_mtime_ns + 1_000_000_000))
+
+    assert monitor.get_unprocessed_files() == [csv_file]
+    assert monitor.process_file(csv_file)
+    with sqlite3.connect(monitor.db_name) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sales").fetchone() == (2,)
+
+
+def test_unchanged_file_is_not_reloaded(folder, tmp_path, monkeypatch):
+    csv_file = folder / "sales.csv"
+    csv_file.write_text("id\n1\n")
+    monitor = make_monitor(folder, tmp_path)
+    monitor.process_all_files()
+
+    monkeypatch.setattr(monitor.csv_retriever, "load_to_sqlite",
+                        lambda *args, **kwargs: pytest.fail("file reloaded"))
+    assert monitor.process_file(csv_file)
+
+
+def test_files_loaded_in_shards_and_merged(folder, tmp_path):
+    for name, rows in [("a", 3), ("b", 2), ("c", 1)]:
+        (folder / f"{name}.csv").write_text("id,label\n" + "".join(f"{i},{name}\n" for i in range(rows)))
+    monitor = make_monitor(folder, tmp_path)
+
+    results = monitor.process_all_files()
+
+    assert results == {str(folder / f"{name}.csv"): True for name in "abc"}
+    assert tables(monitor.db_name) == ["a", "b", "c"]
+    with sqlite3.connect(monitor.db_name) as conn:
+        assert conn.execute("SELECT COUNT(*), MIN(label) FROM a").fetchone() == (3, "a")
+        assert conn.execute("SELECT type FROM pragma_table_info('a') WHERE name = 'id'").fetchone() == ("INTEGER",)
+    # Shard files are cleaned up
+    assert sorted(os.listdir(tmp_path)) == sorted(["data", "target.db", "target.db.manifest"])
+    assert monitor.get_db_schema()["b"] == {"id": "INTEGER", "label": "TEXT"}
+
+
+class FailingInsert:
+    """Wraps a connection so the shard's INSERT fails after the DROP/CREATE ran"""
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, *args):
+        if sql.startswith("INSERT"):
+            raise sqlite3.OperationalError("disk I/O error")
+        return self.conn.execute(sql, *args)
+
+    def close(self):
+        self.conn.close()
+
+
+def test_failed_merge_keeps_old_table(folder, tmp_path, monkeypatch):
+    (folder / "sales.csv").write_text("id\n1\n2\n")
+    monitor = make_monitor(folder, tmp_path)
+    monitor.process_all_files()
+    shard = str(tmp_path / "shard.db")
+    with sqlite3.connect(shard) as conn:
+        conn.execute('CREATE TABLE "sales" (id INTEGER, note TEXT)')
+
+    connect = sqlite3.connect
+    monkeypatch.setattr(data_folder_monitor.sqlite3, "connect",
+                        lambda *args, **kwargs: FailingInsert(connect(*args, **kwargs)))
+    success, message = monitor._merge_shard(shard, "sales")
+    monkeypatch.undo()
+
+    assert not success
+    assert "disk I/O error" in message
+    with sqlite3.connect(monitor.db_name) as conn:
+        assert conn.execute("SELECT * FROM sales ORDER BY id").fetchall() == [(1,), (2,)]
+
+
+def test_settled_files_processed_after_debounce(folder, tmp_path, monkeypatch):
+    monitor = make_monitor(folder, tmp_path)
+    processed = []
+    monkeypatch.setattr(monitor, "process_file", processed.append)
+    quiet, busy = folder / "quiet.csv", folder / "busy.csv"
+    quiet.write_text("id\n1\n")
+    busy.write_text("id\n1\n")
+    now = data_folder_monitor.time.monotonic()
+    pending = {quiet: now - data_folder_monitor.DEBOUNCE_SECONDS - 1, busy: now}
+
+    monitor._process_settled(pending)
+
+    assert processed == [quiet]
+    assert list(pending) == [busy]
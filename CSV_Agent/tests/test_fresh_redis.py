@@ -5,7 +5,6 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agents.redis_cache import RedisCacheAgent
 from models.data_models import QueryContext
-import pandas as pd
 
 print("=" * 60)
 print("TESTING FRESH REDIS CACHE")
@@ -39,7 +38,7 @@ print("✅ Cache miss working correctly")
 print("\n[TEST 3] Cache Save Test")
 context.sql_query = "SELECT COUNT(*) FROM customers;"
 context.formatted_response = "There are 150 customers in the database."
-context.query_results = pd.DataFrame({"count": [150]})
+context.query_results = {"count": [150]}
 cache.cache_query(context)
 print("✅ Data cached")
 
@@ -57,6 +56,7 @@ assert response2.data.get('cache_hit') == True, "Should be cache hit"
 cached_data = response2.data.get('cached_data')
 print(f"SQL Query: {cached_data.get('sql_query')}")
 print(f"Response: {cached_data.get('formatted_response')}")
+assert cached_data.get('query_results') == [{"count": 150}], "Results should round-trip"
 print("✅ Cache hit working correctly")
 
 # Test 5: Cache stats
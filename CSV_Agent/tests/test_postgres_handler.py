@@ -0,0 +1,138 @@
+"""
+Tests for PostgresHandlerAgent's COPY loading path.
+Uses fake DB-API connections, so no PostgreSQL server is needed.
+"""
+import importlib.util
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the CSV_Agent directory to path
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_DIR)
+
+# Load the module directly; the agents package imports every agent's dependencies
+_spec = importlib.util.spec_from_file_location(
+    "postgres_handler", os.path.join(AGENT_DIR, "agents", "postgres_handler.py")
+)
+postgres_handler = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(postgres_handler)
+
+
+class Psycopg2Cursor:
+    def __init__(self, fail=False):
+        self.copies = []
+        self.fail = fail
+
+    def copy_expert(self, sql, file, size):
+        if self.fail:
+            raise RuntimeError("bad value")
+        self.copies.append((sql, file.read()))
+
+
+class Psycopg3Copy:
+    def __init__(self, copies, sql):
+        self.copies, self.sql, self.data = copies, sql, ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.copies.append((self.sql, self.data))
+
+    def write(self, data):
+        self.data += data
+
+
+class Psycopg3Cursor:
+    def __init__(self):
+        self.copies = []
+
+    def copy(self, sql):
+        return Psycopg3Copy(self.copies, sql)
+
+
+class RawConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.committed = self.rolled_back = self.closed = False
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+class Engine:
+    def __init__(self, raw):
+        self.raw = raw
+
+    def raw_connection(self):
+        return self.raw
+
+
+def make_handler(cursor):
+    handler = postgres_handler.PostgresHandlerAgent.__new__(postgres_handler.PostgresHandlerAgent)
+    handler.schema = "public"
+    handler.engine = Engine(RawConnection(cursor))
+    return handler
+
+
+@pytest.fixture
+def df():
+    frame = pd.read_csv(io.StringIO('id,note,amount\n1,NA,1.5\n2,,\n3,"say ""hi""",N/A\n'))
+    frame.insert(0, "user_id", "42")
+    return frame
+
+
+def test_copy_sends_parsed_rows(df):
+    cursor = Psycopg2Cursor()
+    handler = make_handler(cursor)
+
+    assert handler._copy_dataframe(df, "t_42")
+
+    sql, data = cursor.copies[0]
+    assert sql == 'COPY "public"."t_42" ("user_id", "id", "note", "amount") FROM STDIN WITH (FORMAT CSV)'
+    # Values pandas parsed as missing are sent as unquoted empty fields (NULL)
+    assert data == '42,1,,1.5\n42,2,,\n42,3,"say ""hi""",\n'
+    assert handler.engine.raw.committed and handler.engine.raw.closed
+
+
+def test_copy_with_psycopg3(df, monkeypatch):
+    monkeypatch.setattr(postgres_handler, "COPY_CHUNK_ROWS", 2)
+    cursor = Psycopg3Cursor()
+    handler = make_handler(cursor)
+
+    assert handler._copy_dataframe(df, "t_42")
+
+    assert [data for _, data in cursor.copies] == ['42,1,,1.5\n42,2,,\n', '42,3,"say ""hi""",\n']
+
+
+def test_copy_unavailable_falls_back(df):
+    assert not make_handler(object())._copy_dataframe(df, "t_42")
+
+
+def test_copy_error_rolls_back(df):
+    handler = make_handler(Psycopg2Cursor(fail=True))
+
+    assert not handler._copy_dataframe(df, "t_42")
+    assert handler.engine.raw.rolled_back and handler.engine.raw.closed
+
+
+def test_invalid_user_id_rejected_before_loading(tmp_path):
+    handler = make_handler(Psycopg2Cursor())
+    success, message, table = handler.create_and_populate_table("john-doe", str(tmp_path / "missing.csv"))
+
+    assert not success
+    assert "Invalid user ID" in message
+    assert table == ""
@@ -0,0 +1,90 @@
+"""
+Tests for the Arrow-to-SQLite ingest in simplified_query.
+Checks that every column type PyArrow can produce is stored in SQLite,
+that table and column names are quoted safely, and that the pandas
+fallback writes inside the caller's transaction.
+"""
+import datetime
+import decimal
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add the CSV_Agent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simplified_query
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_write_arrow_table_binds_all_types():
+    table = pa.table({
+        "qty": pa.array([1, None], pa.int64()),
+        "price": pa.array([decimal.Decimal("1.25"), None], pa.decimal128(5, 2)),
+        "opened": pa.array([datetime.time(9, 30), None], pa.time32("s")),
+        "wait": pa.array([datetime.timedelta(seconds=5), None], pa.duration("s")),
+        "day": pa.array([datetime.date(2024, 1, 2), None], pa.date32()),
+        "ts": pa.array([datetime.datetime(2024, 1, 2, 3, 4, 5), None], pa.timestamp("s")),
+        "name": pa.array(["a", None]),
+    })
+
+    with sqlite3.connect(":memory:") as conn:
+        assert simplified_query._write_arrow_table(conn, "t", table) == 2
+        rows = conn.execute("SELECT * FROM t").fetchall()
+
+    assert rows[0] == (1, "1.25", "09:30:00", "5", "2024-01-02", "2024-01-02 03:04:05", "a")
+    assert rows[1] == (None,) * 7
+
+
+def test_parsed_csv_keeps_date_and_time_text(tmp_path):
+    csv_file = tmp_path / "shifts.csv"
+    csv_file.write_text("Day,Start Time,Hours\n2024-01-02T08:00,09:00:00,8\n2024-01-03T08:00,13:30:00,4.5\n")
+
+    table_name, table = simplified_query._parse_csv(csv_file)
+    with sqlite3.connect(":memory:") as conn:
+        simplified_query._write_arrow_table(conn, table_name, table)
+        rows = conn.execute(f'SELECT * FROM "{table_name}"').fetchall()
+
+    # Same text the pandas fallback would store
+    assert rows == [("2024-01-02T08:00", "09:00:00", 8.0), ("2024-01-03T08:00", "13:30:00", 4.5)]
+
+
+def test_quotes_in_names_are_escaped():
+    table = pa.table({'say "hi"': pa.array([1, 2])})
+
+    with sqlite3.connect(":memory:") as conn:
+        conn.execute("CREATE TABLE keep (id INTEGER)")
+        assert simplified_query._write_arrow_table(conn, 'x"; DROP TABLE keep; --', table) == 2
+        names = [row[0] for row in conn.execute("SELECT name FROM sqlite_master ORDER BY name")]
+        columns = [row[1] for row in conn.execute("""SELECT * FROM pragma_table_info('x"; DROP TABLE keep; --')""")]
+
+    assert names == ["keep", 'x"; DROP TABLE keep; --']
+    assert columns == ['say "hi"']
+
+
+def test_dataframe_fallback_stays_in_callers_transaction(tmp_path):
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"id": [1, 2], "amount": [1.5, None], "note": ["a", None]})
+    db_path = str(tmp_path / "t.db")
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("BEGIN")
+    assert simplified_query._write_dataframe(conn, "sales", df) == 2
+    assert conn.in_transaction
+    assert conn.execute("SELECT * FROM sales").fetchall() == [(1, 1.5, "a"), (2, None, None)]
+    assert conn.execute("SELECT type FROM pragma_table_info('sales')").fetchall() == [("INTEGER",), ("REAL",), ("TEXT",)]
+    conn.rollback()
+    conn.close()
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT name FROM sqlite_master").fetchall() == []
+
+
+def test_empty_dataframe_creates_table():
+    pd = pytest.importorskip("pandas")
+    with sqlite3.connect(":memory:") as conn:
+        assert simplified_query._write_dataframe(conn, "empty", pd.DataFrame({"id": pd.Series([], dtype="int64")})) == 0
+        assert conn.execute("SELECT COUNT(*) FROM empty").fetchone() == (0,)
@@ -1,10 +1,91 @@
 import os
 import time
+import queue
+import hashlib
+import sqlite3
+import tempfile
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterator, List, Tuple
 from utils.csv_retriever import CSVRetriever
 
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# Seconds without further events before a created or modified file is
+# treated as fully written and loaded
+DEBOUNCE_SECONDS = 1.0
+
+# Sidecar SQLite file (<db_name><suffix>) recording the files that have been
+# loaded, kept out of the target database so it never shows up as a data table
+MANIFEST_SUFFIX = ".manifest"
+MANIFEST_TABLE = "ingest_manifest"
+
+# Bytes hashed from the start of a file to detect rewrites that keep mtime and size
+MANIFEST_HEAD_BYTES = 64 * 1024
+
+# Paths bound per manifest lookup (below SQLite's 999-variable limit)
+MANIFEST_LOOKUP_BATCH = 500
+
+class _CSVEventHandler(FileSystemEventHandler):
+    """Queue paths of CSV files created, modified or moved into the watched folder."""
+    
+    def __init__(self, events: queue.Queue):
+        super().__init__()
+        self.events = events
+    
+    def on_created(self, event):
+        self._enqueue(event.src_path, event.is_directory)
+    
+    def on_modified(self, event):
+        self._enqueue(event.src_path, event.is_directory)
+    
+    def on_moved(self, event):
+        self._enqueue(event.dest_path, event.is_directory)
+    
+    def _enqueue(self, path: str, is_directory: bool):
+        if not is_directory and path.lower().endswith('.csv'):
+            self.events.put(Path(path))
+
+def _table_name_for(file_path: Path, default_table: str) -> str:
+    """Use the filename as the table name unless the default loan table applies."""
+    if default_table == "loan_dt" and "loan" not in file_path.stem.lower():
+        return file_path.stem.lower().replace(" ", "_")
+    return default_table
+
+def _process_one(file_path: Path, shard_path: str, table_name: str) -> Tuple[bool, str]:
+    """
+    Load one CSV file into its own shard database.
+    
+    Runs in a worker process, so it builds its own CSVRetriever and never
+    contends for the target database's write lock.
+    
+    Args:
+        file_path: Path to the CSV file
+        shard_path: Path of the SQLite file to write
+        table_name: Table to create in the shard
+        
+    Returns:
+        Tuple of (success, message) from CSVRetriever.load_to_sqlite
+    """
+    return CSVRetriever().load_to_sqlite(
+        str(file_path),
+        shard_path,
+        table_name=table_name,
+        clean_names=True,
+        if_exists="replace"
+    )
+
 class DataFolderMonitor:
     """
     Utility to monitor a data folder for CSV files and automatically process them.
@@ -30,25 +111,55 @@ class DataFolderMonitor:
         self.db_name = db_name
         self.table_name = table_name
         self.csv_retriever = CSVRetriever()
-        self.processed_files = set()
+        self.manifest_path = f"{db_name}{MANIFEST_SUFFIX}"
+        self._manifest_conn = None
+        
+        # Paths that may have been processed. The bloom filter only rules files
+        # out; the manifest table is the source of truth for the rest. Without
+        # pybloom_live this is a plain set.
+        if ScalableBloomFilter is not None:
+            self._seen_bloom = ScalableBloomFilter(initial_capacity=100_000, error_rate=1e-5)
+        else:
+            self._seen_bloom = set()
         
         # Create the data folder if it doesn't exist and auto_create_folder is True
         if auto_create_folder and not self.data_folder.exists():
             self.data_folder.mkdir(parents=True)
             print(f"Created data folder: {self.data_folder}")
+        
+        self._load_manifest()
     
     def get_unprocessed_files(self) -> List[Path]:
         """
         Get a list of unprocessed CSV files in the data folder.
         
+        Files missing from the bloom filter are new without any lookup; the
+        rest are confirmed against the manifest in batched queries.
+        
         Returns:
             List of paths to unprocessed CSV files
         """
         if not self.data_folder.exists():
             return []
-            
-        csv_files = [f for f in self.data_folder.glob("*.csv") if f.is_file()]
-        return [f for f in csv_files if str(f) not in self.processed_files]
+        
+        files = list(self._iter_csvs())
+        processed = self._confirm_processed([f for f in files if str(f) in self._seen_bloom])
+        return [f for f in files if str(f) not in processed]
+    
+    def _iter_csvs(self) -> Iterator[Path]:
+        """
+        Yield the CSV files directly inside the data folder.
+        
+        os.scandir reports the entry type from the directory listing itself,
+        so no extra stat is needed per file (except for symlinks).
+        
+        Yields:
+            Path of each CSV file
+        """
+        with os.scandir(self.data_folder) as entries:
+            for entry in entries:
+                if entry.name.endswith('.csv') and entry.is_file():
+                    yield Path(entry.path)
     
     def process_file(self, file_path: Path) -> bool:
         """
@@ -63,12 +174,15 @@ class DataFolderMonitor:
         if not file_path.exists():
             print(f"File does not exist: {file_path}")
             return False
+        
+        # Skip files whose manifest entry still matches; they are already loaded
+        signature = self._file_signature(file_path)
+        if self._manifest_entry(file_path) == signature:
+            self._seen_bloom.add(str(file_path))
+            return True
             
         # Extract table name from filename if not specified
-        table_name = self.table_name
-        if table_name == "loan_dt" and "loan" not in file_path.stem.lower():
-            # Use the filename as table name if default is being used and doesn't match
-            table_name = file_path.stem.lower().replace(" ", "_")
+        table_name = _table_name_for(file_path, self.table_name)
         
         # Load the file into the database
         success, message = self.csv_retriever.load_to_sqlite(
@@ -80,7 +194,8 @@ class DataFolderMonitor:
         )
         
         if success:
-            self.processed_files.add(str(file_path))
+            self._seen_bloom.add(str(file_path))
+            self._record_manifest(file_path, signature)
             print(f"Successfully processed {file_path}: {message}")
         else:
             print(f"Failed to process {file_path}: {message}")
@@ -100,20 +215,169 @@ class DataFolderMonitor:
             return {}
             
         results = {}
+        pending = []
         for file_path in unprocessed_files:
-            results[str(file_path)] = self.process_file(file_path)
+            signature = self._file_signature(file_path)
+            if self._manifest_entry(file_path) == signature:
+                self._seen_bloom.add(str(file_path))
+                results[str(file_path)] = True
+            else:
+                pending.append((file_path, signature))
+        
+        # A pool only pays off with more than one file to parse
+        if len(pending) < 2:
+            for file_path, _ in pending:
+                results[str(file_path)] = self.process_file(file_path)
+            return results
+        
+        files = [file_path for file_path, _ in pending]
+        tables = [_table_name_for(file_path, self.table_name) for file_path in files]
+        shard_root = os.path.dirname(os.path.abspath(self.db_name))
+        
+        with tempfile.TemporaryDirectory(dir=shard_root) as shard_dir:
+            shards = [os.path.join(shard_dir, f"shard_{i}.db") for i in range(len(files))]
+            workers = min(len(files), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(_process_one, files, shards, tables))
+            
+            # Merge in file order so the last file wins when two share a table
+            for (file_path, signature), shard, table_name, (success, message) in zip(
+                    pending, shards, tables, outcomes):
+                if success:
+                    success, message = self._merge_shard(shard, table_name)
+                
+                if success:
+                    self._seen_bloom.add(str(file_path))
+                    self._record_manifest(file_path, signature)
+                    print(f"Successfully processed {file_path}: {message}")
+                else:
+                    print(f"Failed to process {file_path}: {message}")
+                results[str(file_path)] = success
             
         return results
     
+    def _merge_shard(self, shard_path: str, table_name: str) -> Tuple[bool, str]:
+        """
+        Copy a table from a shard database into the target database.
+        
+        The table is recreated from the shard's own CREATE statement, so column
+        types are kept, and replaces any existing table of the same name in one
+        transaction, so a failed copy leaves the old table in place.
+        
+        Args:
+            shard_path: Path to the shard SQLite file
+            table_name: Table to copy
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        quoted = '"' + table_name.replace('"', '""') + '"'
+        try:
+            # Autocommit mode, so the explicit BEGIN covers the DDL as well
+            conn = sqlite3.connect(self.db_name, isolation_level=None)
+            try:
+                conn.execute("ATTACH DATABASE ? AS shard", (shard_path,))
+                create_sql = conn.execute(
+                    "SELECT sql FROM shard.sqlite_master WHERE type = 'table' AND name = ?",
+                    (table_name,)
+                ).fetchone()[0]
+                conn.execute("BEGIN")
+                try:
+                    conn.execute(f"DROP TABLE IF EXISTS main.{quoted}")
+                    conn.execute(create_sql)
+                    row_count = conn.execute(
+                        f"INSERT INTO main.{quoted} SELECT * FROM shard.{quoted}"
+                    ).rowcount
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("DETACH DATABASE shard")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            return False, f"Error merging shard: {e}"
+        
+        tables = self.csv_retriever.db_table_map.setdefault(self.db_name, [])
+        if table_name not in tables:
+            tables.append(table_name)
+        self.csv_retriever.current_db = self.db_name
+        return True, f"Successfully loaded {row_count} rows into {self.db_name}, table {table_name}"
+    
     def watch_folder(self, interval: int = 5, max_iterations: Optional[int] = None):
         """
-        Watch the data folder for new CSV files and process them.
+        Watch the data folder for new or changed CSV files and process them.
+        
+        Uses filesystem notifications when the watchdog package is installed,
+        and falls back to polling every interval seconds otherwise.
+        
+        Args:
+            interval: Number of seconds between scan passes
+            max_iterations: Maximum number of scan passes (None for infinite)
+        """
+        print(f"Watching folder {self.data_folder} for CSV files...")
+        if Observer is None:
+            self._poll_folder(interval, max_iterations)
+            return
+        
+        events = queue.Queue()
+        observer = Observer()
+        observer.schedule(_CSVEventHandler(events), str(self.data_folder), recursive=False)
+        observer.start()
+        
+        # Path -> monotonic time of its latest event; a file is loaded once it
+        # has been quiet for DEBOUNCE_SECONDS, so a file still being written
+        # (one modified event per write) is loaded once, after the last write
+        pending: Dict[Path, float] = {}
+        iteration = 0
+        
+        try:
+            # Pick up files that were added before the observer started
+            self.process_all_files()
+            next_pass = time.monotonic() + interval
+            while max_iterations is None or iteration < max_iterations:
+                # Collect events until the next pass is due
+                timeout = next_pass - time.monotonic()
+                if timeout > 0:
+                    try:
+                        pending[events.get(timeout=timeout)] = time.monotonic()
+                        continue
+                    except queue.Empty:
+                        pass
+                
+                # One scan pass over the files that have settled
+                self._process_settled(pending)
+                iteration += 1
+                next_pass = time.monotonic() + interval
+        except KeyboardInterrupt:
+            print("Folder watching stopped by user.")
+        finally:
+            observer.stop()
+            observer.join()
+    
+    def _process_settled(self, pending: Dict[Path, float]):
+        """
+        Process pending files with no events in the last DEBOUNCE_SECONDS.
+        
+        Files that are still changing stay pending for the next pass.
+        
+        Args:
+            pending: Mapping of path to the time of its latest event (updated in place)
+        """
+        cutoff = time.monotonic() - DEBOUNCE_SECONDS
+        for file_path in [path for path, last_event in pending.items() if last_event <= cutoff]:
+            del pending[file_path]
+            if file_path.exists():
+                self.process_file(file_path)
+    
+    def _poll_folder(self, interval: int, max_iterations: Optional[int]):
+        """
+        Poll the data folder for new CSV files.
         
         Args:
             interval: Number of seconds to wait between checks
             max_iterations: Maximum number of iterations (None for infinite)
         """
-        print(f"Watching folder {self.data_folder} for CSV files...")
         iteration = 0
         
         try:
@@ -124,6 +388,124 @@ class DataFolderMonitor:
         except KeyboardInterrupt:
             print("Folder watching stopped by user.")
             
+    def _file_signature(self, file_path: Path) -> tuple:
+        """
+        Build the manifest signature of a file.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Tuple of (mtime_ns, size, SHA-1 of the first 64 KB)
+        """
+        stat = file_path.stat()
+        with open(file_path, 'rb') as f:
+            head_sha1 = hashlib.sha1(f.read(MANIFEST_HEAD_BYTES)).digest()
+        return stat.st_mtime_ns, stat.st_size, head_sha1
+    
+    def _manifest(self) -> sqlite3.Connection:
+        """Return the manifest connection, opening it and creating the table on first use."""
+        if self._manifest_conn is None:
+            conn = sqlite3.connect(self.manifest_path)
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} "
+                "(path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, head_sha1 BLOB)"
+            )
+            self._manifest_conn = conn
+        return self._manifest_conn
+    
+    def _load_manifest(self):
+        """
+        Add the paths recorded in the manifest to the bloom filter.
+        
+        Nothing is stat'ed here; get_unprocessed_files confirms each candidate
+        against the manifest, so stale entries are still picked up and reloaded.
+        """
+        if not os.path.exists(self.manifest_path):
+            return
+        
+        try:
+            for (path,) in self._manifest().execute(f"SELECT path FROM {MANIFEST_TABLE}"):
+                self._seen_bloom.add(path)
+        except sqlite3.Error as e:
+            print(f"Error reading ingest manifest: {e}")
+    
+    def _confirm_processed(self, files: List[Path]) -> set:
+        """
+        Check files against the manifest.
+        
+        A file counts as processed when its manifest entry matches its current
+        mtime and size.
+        
+        Args:
+            files: Paths to check
+            
+        Returns:
+            Set of path strings that are already processed
+        """
+        processed = set()
+        if not files:
+            return processed
+        
+        try:
+            conn = self._manifest()
+            for start in range(0, len(files), MANIFEST_LOOKUP_BATCH):
+                batch = [str(f) for f in files[start:start + MANIFEST_LOOKUP_BATCH]]
+                placeholders = ", ".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT path, mtime_ns, size FROM {MANIFEST_TABLE} "
+                    f"WHERE path IN ({placeholders})",
+                    batch
+                )
+                for path, mtime_ns, size in rows:
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+                        processed.add(path)
+        except sqlite3.Error as e:
+            print(f"Error reading ingest manifest: {e}")
+        
+        return processed
+    
+    def _manifest_entry(self, file_path: Path) -> Optional[tuple]:
+        """
+        Look up the manifest signature recorded for a file.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Tuple of (mtime_ns, size, head_sha1), or None if the file is not recorded
+        """
+        try:
+            return self._manifest().execute(
+                f"SELECT mtime_ns, size, head_sha1 FROM {MANIFEST_TABLE} WHERE path = ?",
+                (str(file_path),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading ingest manifest: {e}")
+            return None
+    
+    def _record_manifest(self, file_path: Path, signature: tuple):
+        """
+        Record a loaded file's signature in the manifest.
+        
+        Args:
+            file_path: Path to the file
+            signature: Tuple of (mtime_ns, size, head_sha1)
+        """
+        try:
+            conn = self._manifest()
+            with conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {MANIFEST_TABLE} VALUES (?, ?, ?, ?)",
+                    (str(file_path), *signature)
+                )
+        except sqlite3.Error as e:
+            print(f"Error updating ingest manifest: {e}")
+            
     def get_db_schema(self) -> Dict[str, Dict[str, str]]:
         """
         Get the schema of all tables in the database.
@@ -131,10 +513,22 @@ class DataFolderMonitor:
         Returns:
             Dictionary mapping table names to their schemas
         """
-        tables = self.csv_retriever.list_tables(self.db_name)
         schema = {}
+        try:
+            conn = sqlite3.connect(self.db_name)
+            try:
+                rows = conn.execute(
+                    "SELECT m.name, p.name, p.type "
+                    "FROM sqlite_master m, pragma_table_info(m.name) p "
+                    "WHERE m.type = 'table'"
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error retrieving schema: {e}")
+            return schema
         
-        for table in tables:
-            schema[table] = self.csv_retriever.get_schema(self.db_name, table)
+        for table, column, col_type in rows:
+            schema.setdefault(table, {})[column] = col_type
             
-        return schema 
\ No newline at end of file
+        return schema
@@ -8,6 +8,7 @@ import os
 import sys
 import json
 import argparse
+from pathlib import Path
 from utils.data_folder_monitor import DataFolderMonitor
 
 def main():
@@ -30,8 +31,7 @@ def main():
         print("Please run main.py first to create a default configuration.")
         sys.exit(1)
         
-    with open(config_path, 'r') as f:
-        config = json.load(f)
+    config = json.loads(Path(config_path).read_bytes())
     
     # Get database config from config.json
     db_config = config.get('database', {})
@@ -16,10 +16,16 @@ Usage:
 
 import sys
 import os
+import queue
+import atexit
+import asyncio
+import hashlib
+import logging
+import logging.handlers
 import argparse
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
-import json
+from typing import Optional, Dict, Any, List
 
 # Add CSV_Agent to the path
 csv_agent_path = Path(__file__).parent.parent / "CSV_Agent"
@@ -33,27 +39,113 @@ from mcp.server.fastmcp import FastMCP
 from core.orchestrator import TextSQLOrchestrator
 
 # Import from local utils package (must be after path setup)
-from utils.db_helper import delete_user_table, list_user_tables
+from utils.db_helper import (
+    delete_user_table_async, delete_user_tables, find_ingestion, invalidate_user_tables,
+    list_user_tables, load_config, record_ingestion
+)
+from utils.embed_batcher import EmbedBatcher
+from utils.embedding_cache import get_or_embed
+from utils import semantic_cache
+from utils.validators import reject_invalid_user, user_table_name
 
 # Initialize FastMCP server
 mcp = FastMCP("CSV MCP Server")
 
+# Log records are queued and written to stderr by a background thread, so
+# tool handlers never block on the stdio pipe
+logger = logging.getLogger("csv_mcp")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_stderr_handler = logging.StreamHandler(sys.stderr)
+_stderr_handler.setFormatter(logging.Formatter("%(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _stderr_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Semantic cache thresholds come from this server's config.json
+_server_config_path = current_dir / "config.json"
+if _server_config_path.exists():
+    _cache_settings = load_config(_server_config_path).get("semantic_cache", {})
+    semantic_cache.configure(_cache_settings.get("max_distance"), _cache_settings.get("ttl_seconds"))
+
 # Global orchestrator instance
 orchestrator: Optional[TextSQLOrchestrator] = None
+_orchestrator_lock = threading.Lock()
+
+# Model behind ChromaDB's default embedding function, used for the metadata collections
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+_embedding_function = None
+
+# Bytes read at a time when hashing uploaded files
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def get_embedding_function():
+    """Get ChromaDB's default embedding function, creating it once."""
+    global _embedding_function
+    if _embedding_function is None:
+        from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+        _embedding_function = DefaultEmbeddingFunction()
+    return _embedding_function
+
+
+# Cache misses from concurrent tool calls share one model call
+_embed_batcher = EmbedBatcher(lambda texts: get_embedding_function()(texts))
+
+
+def embed_query(text: str) -> List[float]:
+    """Embed a query with ChromaDB's default model, through the persistent cache."""
+    return get_or_embed(text, EMBEDDING_MODEL, _embed_batcher.embed)
+
+
+def file_sha256(file_path: str) -> str:
+    """Hash a file's contents without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 def get_orchestrator() -> TextSQLOrchestrator:
     """Get or create the orchestrator instance."""
     global orchestrator
-    if orchestrator is None:
-        # Load config from CSV_Agent
-        config_path = csv_agent_path / "config.json"
-        orchestrator = TextSQLOrchestrator(str(config_path))
+    # Tools run in worker threads, so only one of them may build the orchestrator
+    with _orchestrator_lock:
+        if orchestrator is None:
+            # Load config from CSV_Agent
+            config_path = csv_agent_path / "config.json"
+            orchestrator = TextSQLOrchestrator(str(config_path))
+            
+            # Semantic table lookups reuse cached query embeddings
+            indexer = orchestrator.agents.get('metadata_indexer')
+            if indexer is not None:
+                indexer.query_embedder = embed_query
+            
+            # Connect to the database, load the LLMs and the embedding model now
+            # rather than on the first query
+            orchestrator.warmup()
+            try:
+                get_embedding_function()(["warmup"])
+            except Exception as e:
+                logger.warning("Warmup: could not load embedding model: %s", e)
     return orchestrator
 
 
+def _same_table(existing_table: str, table_name: Optional[str], user_id: str) -> bool:
+    """Whether an upload asking for table_name would land in existing_table."""
+    if not table_name or not table_name.strip():
+        return True
+    try:
+        return user_table_name(table_name.strip().lower(), user_id) == existing_table
+    except ValueError:
+        return False
+
+
 @mcp.tool()
-def upload_csv(
+async def upload_csv(
     file_path: str,
     table_name: Optional[str] = None,
     user_id: str = "default_user"
@@ -78,14 +170,16 @@ def upload_csv(
     """
     try:
         # Validate file path
-        if not os.path.exists(file_path):
+        try:
+            file_stat = os.stat(file_path)
+        except (FileNotFoundError, NotADirectoryError):
             return {
                 "success": False,
                 "message": f"File not found: {file_path}",
                 "error": "FILE_NOT_FOUND"
             }
         
-        if not file_path.lower().endswith('.csv'):
+        if os.path.splitext(file_path)[1].lower() != '.csv':
             return {
                 "success": False,
                 "message": "File must be a CSV file",
@@ -100,9 +194,30 @@ def upload_csv(
                 "error": "MISSING_USER_ID"
             }
         
-        # Process upload through orchestrator
-        orch = get_orchestrator()
-        context = orch.process_upload(
+        rejection = reject_invalid_user(user_id.strip())
+        if rejection:
+            return rejection
+        
+        # Skip the whole pipeline when this exact file is already loaded for the user
+        config = load_config(csv_agent_path / "config.json")
+        content_hash = await asyncio.to_thread(file_sha256, file_path)
+        existing_table = await asyncio.to_thread(find_ingestion, user_id.strip(), content_hash, config)
+        if existing_table and _same_table(existing_table, table_name, user_id.strip()):
+            return {
+                "success": True,
+                "message": f"CSV already uploaded to table: {existing_table}",
+                "table_name": existing_table,
+                "user_id": user_id,
+                "file_processed": file_path,
+                "file_size": file_stat.st_size,
+                "deduplicated": True
+            }
+        
+        # Process upload through orchestrator (in a worker thread, so the
+        # server's event loop keeps serving other requests)
+        orch = await asyncio.to_thread(get_orchestrator)
+        context = await asyncio.to_thread(
+            orch.process_upload,
             csv_file=file_path,
             user_id=user_id.strip(),
             suggested_table_name=table_name
@@ -116,12 +231,19 @@ def upload_csv(
                 "error": "UPLOAD_FAILED"
             }
         
+        await asyncio.to_thread(record_ingestion, user_id.strip(), content_hash, context.table_name, config)
+        
+        # Cached answers and table listings may no longer reflect this user's tables
+        invalidate_user_tables(user_id.strip())
+        await asyncio.to_thread(semantic_cache.invalidate_user, user_id.strip())
+        
         return {
             "success": True,
             "message": f"CSV uploaded successfully to table: {context.table_name}",
             "table_name": context.table_name,
             "user_id": user_id,
-            "file_processed": file_path
+            "file_processed": file_path,
+            "file_size": file_stat.st_size
         }
         
     except Exception as e:
@@ -134,7 +256,7 @@ def upload_csv(
 
 
 @mcp.tool()
-def query_data(
+async def query_data(
     query: str,
     table_name: Optional[str] = None,
     user_id: str = "default_user"
@@ -173,26 +295,44 @@ def query_data(
                 "error": "MISSING_USER_ID"
             }
         
+        rejection = reject_invalid_user(user_id.strip())
+        if rejection:
+            return rejection
+        
         # Use empty string if table_name not provided - let metadata indexer find it
         if not table_name:
             table_name = ""
-            print(f"[Query] No table specified, will use semantic search to find relevant table", file=sys.stderr)
+            logger.info("[Query] No table specified, will use semantic search to find relevant table")
         
         # Log query start
-        print(f"[Query] Starting query: {query[:50]}...", file=sys.stderr)
+        logger.info("[Query] Starting query: %s...", query[:50])
+        
+        # Answer near-duplicate questions from the semantic response cache
+        query_vec = None
+        try:
+            query_vec = await asyncio.to_thread(embed_query, query.strip())
+            cached = await asyncio.to_thread(
+                semantic_cache.lookup, user_id.strip(), table_name.strip(), query.strip(), query_vec
+            )
+            if cached is not None:
+                logger.info("[Query] Semantic cache hit")
+                return {**cached, "cached": True}
+        except Exception as e:
+            logger.warning("[Query] Semantic cache unavailable: %s", e)
         
         # Process query through orchestrator
-        orch = get_orchestrator()
+        orch = await asyncio.to_thread(get_orchestrator)
         
-        print(f"[Query] Processing with orchestrator...", file=sys.stderr)
-        context = orch.process_query(
+        logger.info("[Query] Processing with orchestrator...")
+        context = await asyncio.to_thread(
+            orch.process_query,
             user_question=query.strip(),
             db_name="",
             table_name=table_name.strip() if table_name else "",
             user_id=user_id.strip()
         )
         
-        print(f"[Query] Processing complete", file=sys.stderr)
+        logger.info("[Query] Processing complete")
         
         # Extract results
         if hasattr(context, 'error') and context.error:
@@ -210,11 +350,13 @@ def query_data(
         # Get raw query results
         query_results = None
         row_count = 0
+        truncated = False
         if hasattr(context, 'query_results') and context.query_results is not None:
             # Convert DataFrame to dict if needed
             if hasattr(context.query_results, 'to_dict'):
                 query_results = context.query_results.to_dict('records')
                 row_count = len(context.query_results)
+                truncated = bool(context.query_results.attrs.get("truncated", False))
             else:
                 query_results = context.query_results
                 row_count = len(context.query_results) if isinstance(context.query_results, list) else 0
@@ -226,15 +368,24 @@ def query_data(
             "sql_query": getattr(context, 'sql_query', None),
             "results": query_results,
             "row_count": row_count,
+            "truncated": truncated,  # True when the query returned more rows than were fetched
             "user_id": user_id,
             "table_name": getattr(context, 'table_name', table_name)  # Return actual table used
         }
         
-        print(f"[Query] Returning {row_count} rows with formatted answer", file=sys.stderr)
+        if query_vec is not None:
+            try:
+                await asyncio.to_thread(
+                    semantic_cache.store, user_id.strip(), table_name.strip(), query.strip(), query_vec, result
+                )
+            except Exception as e:
+                logger.warning("[Query] Could not cache response: %s", e)
+        
+        logger.info("[Query] Returning %d rows with formatted answer", row_count)
         return result
         
     except Exception as e:
-        print(f"[Query] Error: {str(e)}", file=sys.stderr)
+        logger.error("[Query] Error: %s", e)
         return {
             "success": False,
             "message": f"Error executing query: {str(e)}",
@@ -244,7 +395,7 @@ def query_data(
 
 
 @mcp.tool()
-def delete_data(
+async def delete_data(
     table_name: str,
     confirm: bool = False,
     user_id: str = "default_user"
@@ -272,6 +423,10 @@ def delete_data(
                 "error": "MISSING_USER_ID"
             }
         
+        rejection = reject_invalid_user(user_id.strip())
+        if rejection:
+            return rejection
+        
         if not table_name or not table_name.strip():
             return {
                 "success": False,
@@ -289,18 +444,17 @@ def delete_data(
             }
         
         # Get config for database connection
-        config_path = csv_agent_path / "config.json"
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        config = load_config(csv_agent_path / "config.json")
         
         # Delete table and metadata
-        success, message, details = delete_user_table(
+        success, message, details = await delete_user_table_async(
             user_id=user_id.strip(),
             table_name=table_name.strip(),
             config=config
         )
         
         if success:
+            await asyncio.to_thread(semantic_cache.invalidate_user, user_id.strip())
             return {
                 "success": True,
                 "message": message,
@@ -326,7 +480,94 @@ def delete_data(
 
 
 @mcp.tool()
-def list_tables(user_id: str = "default_user") -> Dict[str, Any]:
+async def delete_data_batch(
+    table_names: List[str],
+    confirm: bool = False,
+    user_id: str = "default_user"
+) -> Dict[str, Any]:
+    """
+    Delete several uploaded CSV tables and their metadata at once. PERMANENT action!
+    
+    Args:
+        table_names: Names of the tables to delete
+        confirm: Must be True to actually delete (safety check)
+        user_id: Optional user identifier (defaults to "default_user")
+    
+    Returns:
+        Deletion status and details
+    
+    Example:
+        delete_data_batch(table_names=["customers", "orders"], confirm=True)
+    """
+    try:
+        # Validate inputs
+        if not user_id or not user_id.strip():
+            return {
+                "success": False,
+                "message": "User ID is required",
+                "error": "MISSING_USER_ID"
+            }
+        
+        rejection = reject_invalid_user(user_id.strip())
+        if rejection:
+            return rejection
+        
+        names = [name.strip() for name in table_names or [] if name and name.strip()]
+        if not names:
+            return {
+                "success": False,
+                "message": "At least one table name is required",
+                "error": "MISSING_TABLE_NAME"
+            }
+        
+        # Safety check
+        if not confirm:
+            return {
+                "success": False,
+                "message": "Deletion not confirmed. Set confirm=True to delete data.",
+                "error": "NOT_CONFIRMED",
+                "warning": "This action is permanent and cannot be undone!"
+            }
+        
+        # Get config for database connection
+        config = load_config(csv_agent_path / "config.json")
+        
+        # Delete tables and metadata
+        success, message, details = await asyncio.to_thread(
+            delete_user_tables,
+            user_id=user_id.strip(),
+            table_names=names,
+            config=config
+        )
+        
+        if success:
+            await asyncio.to_thread(semantic_cache.invalidate_user, user_id.strip())
+            return {
+                "success": True,
+                "message": message,
+                "user_id": user_id,
+                "table_names": names,
+                **details
+            }
+        else:
+            return {
+                "success": False,
+                "message": message,
+                "error": "DELETION_FAILED",
+                **details
+            }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error deleting data: {str(e)}",
+            "error": "EXCEPTION",
+            "error_details": str(e)
+        }
+
+
+@mcp.tool()
+async def list_tables(user_id: str = "default_user") -> Dict[str, Any]:
     """
     List all your uploaded CSV tables.
     
@@ -347,13 +588,15 @@ def list_tables(user_id: str = "default_user") -> Dict[str, Any]:
                 "error": "MISSING_USER_ID"
             }
         
+        rejection = reject_invalid_user(user_id.strip())
+        if rejection:
+            return rejection
+        
         # Get config
-        config_path = csv_agent_path / "config.json"
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        config = load_config(csv_agent_path / "config.json")
         
         # List tables
-        tables = list_user_tables(user_id.strip(), config)
+        tables = await asyncio.to_thread(list_user_tables, user_id.strip(), config)
         
         return {
             "success": True,
@@ -393,6 +636,10 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
+    # Build and warm up the orchestrator while the transport starts; tool
+    # calls that arrive first wait for it in get_orchestrator
+    threading.Thread(target=get_orchestrator, daemon=True).start()
+    
     if args.http:
         # HTTP/SSE mode using environment variables
         import os
@@ -405,7 +652,7 @@ if __name__ == "__main__":
         print("=" * 60, file=sys.stderr)
         print(f"Server URL: http://{args.host}:{args.port}", file=sys.stderr)
         print(f"SSE Endpoint: http://{args.host}:{args.port}/sse", file=sys.stderr)
-        print("Available Tools: upload_csv, query_data, delete_data, list_tables", file=sys.stderr)
+        print("Available Tools: upload_csv, query_data, delete_data, delete_data_batch, list_tables", file=sys.stderr)
         print("=" * 60, file=sys.stderr)
         
         # Run with SSE transport
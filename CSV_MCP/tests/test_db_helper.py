@@ -0,0 +1,195 @@
+"""
+Database Helper Tests
+
+Checks the PostgreSQL helpers used by the MCP tools:
+1. Table listings/infos are cached with a TTL and invalidated per user
+2. Several tables are dropped with one DROP statement
+3. Invalid user IDs are rejected before touching the database
+4. An unusable ingestion ledger never fails ingest or delete
+5. The ingestion ledger and multi-table delete against a real server
+   (set CSV_MCP_TEST_POSTGRES_URL to run these)
+"""
+
+import os
+import sys
+import uuid
+
+import pytest
+
+# Add this package and CSV_Agent (for core.identifiers) to path
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(package_dir), "CSV_Agent"))
+sys.path.insert(0, package_dir)
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("chromadb")
+
+from sqlalchemy import create_engine, text
+
+from utils import db_helper
+
+POSTGRES_URL = os.environ.get("CSV_MCP_TEST_POSTGRES_URL")
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start each test with no cached listings"""
+    db_helper._table_cache.clear()
+    yield
+    db_helper._table_cache.clear()
+
+
+def make_config(db_url="postgresql://user@localhost/unused", schema="public", chroma_dir="chroma"):
+    return {"agents": {
+        "postgres_handler": {"params": {"db_url": db_url, "schema": schema}},
+        "metadata_indexer": {"params": {"chroma_persist_dir": str(chroma_dir)}},
+    }}
+
+
+def test_cache_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(db_helper.time, "monotonic", lambda: now[0])
+    db_helper._cache_put(("list", "u1", "public"), ("sales",))
+
+    now[0] += db_helper.LIST_TABLES_TTL - 1
+    assert db_helper._cache_get(("list", "u1", "public"), db_helper.LIST_TABLES_TTL) == ("sales",)
+    now[0] += 2
+    assert db_helper._cache_get(("list", "u1", "public"), db_helper.LIST_TABLES_TTL) is None
+
+
+def test_invalidate_only_drops_that_user():
+    db_helper._cache_put(("list", "u1", "public"), ("sales",))
+    db_helper._cache_put(("info", "u1", "public", "sales"), {"exists": True})
+    db_helper._cache_put(("list", "u2", "public"), ("orders",))
+
+    db_helper.invalidate_user_tables("u1")
+
+    assert list(db_helper._table_cache) == [("list", "u2", "public")]
+
+
+def test_cache_evicts_oldest_when_full(monkeypatch):
+    monkeypatch.setattr(db_helper, "TABLE_CACHE_SIZE", 2)
+    for user_id in ("u1", "u2", "u3"):
+        db_helper._cache_put(("list", user_id, "public"), ())
+
+    assert [key[1] for key in db_helper._table_cache] == ["u2", "u3"]
+
+
+def test_list_user_tables_reuses_cached_listing(monkeypatch):
+    connects = []
+
+    class Engine:
+        def connect(self):
+            connects.append(1)
+            raise AssertionError("cached listing not used")
+
+    monkeypatch.setattr(db_helper, "_get_engine", lambda db_url: Engine())
+    db_helper._cache_put(("list", "u1", "public"), ("sales", "orders"))
+
+    assert db_helper.list_user_tables("u1", make_config()) == ["sales", "orders"]
+    assert connects == []
+
+
+def test_drop_statement_covers_all_tables():
+    stmt = db_helper._drop_stmt("public", ("sales_u1", "orders_u1"))
+    assert str(stmt) == 'DROP TABLE IF EXISTS "public"."sales_u1", "public"."orders_u1" CASCADE'
+
+
+@pytest.mark.parametrize("call", [
+    lambda config: db_helper.delete_user_tables("john-doe", ["sales"], config),
+    lambda config: db_helper.delete_user_table("john-doe", "sales", config),
+])
+def test_invalid_user_id_rejected_before_connecting(call, monkeypatch):
+    monkeypatch.setattr(db_helper, "_get_engine", lambda db_url: pytest.fail("connected"))
+    success, message, _ = call(make_config())
+    assert not success
+    assert "Invalid user ID" in message
+
+
+def test_list_user_tables_rejects_invalid_user_id(monkeypatch):
+    monkeypatch.setattr(db_helper, "_get_engine", lambda db_url: pytest.fail("connected"))
+    assert db_helper.list_user_tables("a.b", make_config()) == []
+
+
+@pytest.fixture
+def pg(tmp_path):
+    """A throwaway schema on the test server"""
+    if not POSTGRES_URL:
+        pytest.skip("CSV_MCP_TEST_POSTGRES_URL not set")
+    schema = f"test_{uuid.uuid4().hex[:8]}"
+    engine = create_engine(POSTGRES_URL)
+    with engine.connect() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+        conn.commit()
+    yield engine, schema, make_config(POSTGRES_URL, schema, tmp_path)
+    with engine.connect() as conn:
+        conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        conn.execute(text(f'DELETE FROM "{db_helper.LEDGER_SCHEMA}"."{db_helper.INGESTIONS_TABLE}" '
+                          'WHERE table_schema = :schema'), {"schema": schema})
+        conn.commit()
+    engine.dispose()
+
+
+def create_tables(engine, schema, *names):
+    with engine.connect() as conn:
+        for name in names:
+            conn.execute(text(f'CREATE TABLE "{schema}"."{name}" (id int)'))
+        conn.commit()
+
+
+def test_ledger_finds_only_existing_tables(pg):
+    engine, schema, config = pg
+    create_tables(engine, schema, "sales_u1")
+
+    assert db_helper.record_ingestion("u1", "abc", "sales_u1", config)
+    assert db_helper.find_ingestion("u1", "abc", config) == "sales_u1"
+    assert db_helper.find_ingestion("u2", "abc", config) is None
+
+    with engine.connect() as conn:
+        conn.execute(text(f'DROP TABLE "{schema}"."sales_u1"'))
+        conn.commit()
+    assert db_helper.find_ingestion("u1", "abc", config) is None
+
+
+def test_ledger_stays_out_of_data_schema(pg):
+    engine, schema, config = pg
+    create_tables(engine, schema, "sales_u1")
+    db_helper.record_ingestion("u1", "abc", "sales_u1", config)
+
+    with engine.connect() as conn:
+        names = [row[0] for row in conn.execute(
+            text("SELECT tablename FROM pg_tables WHERE schemaname = :schema"), {"schema": schema}
+        )]
+    assert names == ["sales_u1"]
+
+
+def test_delete_user_tables_drops_and_forgets(pg):
+    engine, schema, config = pg
+    long_name = "quarterly_revenue_by_region_and_product_line_for_fiscal_year_totals"
+    assert db_helper.user_table_name(long_name, "u1") != db_helper.legacy_table_name(long_name, "u1")
+    legacy = db_helper.legacy_table_name(long_name, "u1")
+    create_tables(engine, schema, "sales_u1", "orders_u1", legacy, "sales_u2")
+    db_helper.record_ingestion("u1", "abc", "sales_u1", config)
+
+    success, _, details = db_helper.delete_user_tables("u1", ["sales", "orders", long_name, "missing"], config)
+
+    assert success
+    assert details["deleted_tables"] == ["sales_u1", "orders_u1", legacy]
+    assert details["missing_tables"] == ["missing"]
+    assert db_helper.list_user_tables("u1", config) == []
+    assert db_helper.list_user_tables("u2", config) == ["sales"]
+    assert db_helper.find_ingestion("u1", "abc", config) is None
+
+
+def test_ledger_failure_is_not_fatal_or_cached(monkeypatch):
+    class Engine:
+        def connect(self):
+            raise PermissionError("permission denied for database")
+
+    monkeypatch.setattr(db_helper, "_get_engine", lambda db_url: Engine())
+    db_helper._create_ingestions_table.cache_clear()
+
+    assert db_helper._ensure_ingestions_table("postgresql://nocreate@localhost/db") is False
+    assert db_helper.find_ingestion("u1", "abc", make_config()) is None
+    assert db_helper.record_ingestion("u1", "abc", "sales_u1", make_config()) is False
+    assert db_helper._create_ingestions_table.cache_info().currsize == 0
@@ -0,0 +1,79 @@
+"""
+Embedding Batcher Tests
+
+Checks that concurrent requests share model calls:
+1. Requests arriving together are embedded in one call
+2. Each caller gets its own vector
+3. Batches are capped at max_batch
+4. A failed model call fails every request in its batch
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.embed_batcher import EmbedBatcher
+
+
+class BatchModel:
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+def test_concurrent_requests_share_a_call():
+    model = BatchModel()
+    batcher = EmbedBatcher(model, window=0.2)
+    texts = [f"question {'x' * i}" for i in range(8)]
+
+    futures = [batcher.submit(text) for text in texts]
+
+    assert [future.result(timeout=5) for future in futures] == [[float(len(text))] for text in texts]
+    assert model.batches == [texts]
+
+
+def test_blocking_embed_from_threads():
+    model = BatchModel()
+    batcher = EmbedBatcher(model, window=0.05)
+    texts = [f"q{i}" * (i + 1) for i in range(16)]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        vectors = list(pool.map(batcher.embed, texts))
+
+    assert vectors == [[float(len(text))] for text in texts]
+    assert sum(len(batch) for batch in model.batches) == 16
+    assert len(model.batches) < 16
+
+
+def test_batches_capped_at_max_batch():
+    model = BatchModel()
+    batcher = EmbedBatcher(model, window=0.2, max_batch=3)
+
+    futures = [batcher.submit(str(i)) for i in range(7)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert [len(batch) for batch in model.batches] == [3, 3, 1]
+
+
+def test_model_error_fails_whole_batch():
+    def broken(texts):
+        raise RuntimeError("model unavailable")
+
+    batcher = EmbedBatcher(broken, window=0.2)
+    futures = [batcher.submit("a"), batcher.submit("b")]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model unavailable"):
+            future.result(timeout=5)
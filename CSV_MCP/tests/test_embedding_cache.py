@@ -0,0 +1,80 @@
+"""
+Embedding Cache Tests
+
+Checks the two cache layers in front of the embedding model:
+1. Repeated texts are embedded once (in-process LRU)
+2. Embeddings survive a new process (SQLite file)
+3. The model name is part of the key
+4. The LRU evicts the least recently used entry
+"""
+
+import os
+import sys
+from collections import OrderedDict
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import embedding_cache
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    """Point the cache at a fresh SQLite file and an empty LRU for each test"""
+    monkeypatch.setattr(embedding_cache, "CACHE_PATH", tmp_path / "embeddings.sqlite")
+    monkeypatch.setattr(embedding_cache, "_conn", None)
+    monkeypatch.setattr(embedding_cache, "_memory", OrderedDict())
+    yield embedding_cache
+    if embedding_cache._conn is not None:
+        embedding_cache._conn.close()
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return [float(len(text)), 0.5]
+
+
+def test_repeated_text_embedded_once(cache):
+    model = CountingModel()
+    assert cache.get_or_embed("total sales", "m", model) == [11.0, 0.5]
+    assert cache.get_or_embed("total sales", "m", model) == [11.0, 0.5]
+    assert model.calls == ["total sales"]
+
+
+def test_embeddings_persist_across_processes(cache, monkeypatch):
+    cache.get_or_embed("total sales", "m", CountingModel())
+
+    # A new process starts with an empty LRU and a fresh connection
+    cache._conn.close()
+    monkeypatch.setattr(embedding_cache, "_conn", None)
+    monkeypatch.setattr(embedding_cache, "_memory", OrderedDict())
+
+    model = CountingModel()
+    assert cache.get_or_embed("total sales", "m", model) == [11.0, 0.5]
+    assert model.calls == []
+
+
+def test_model_is_part_of_key(cache):
+    model = CountingModel()
+    cache.get_or_embed("total sales", "m1", model)
+    cache.get_or_embed("total sales", "m2", model)
+    assert model.calls == ["total sales", "total sales"]
+
+
+def test_lru_evicts_least_recently_used(cache, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "MEMORY_CACHE_SIZE", 2)
+    model = CountingModel()
+    cache.get_or_embed("a", "m", model)
+    cache.get_or_embed("b", "m", model)
+    cache.get_or_embed("a", "m", model)
+    cache.get_or_embed("c", "m", model)
+
+    assert [key[0] for key in cache._memory] == [
+        embedding_cache.hashlib.sha256(text.encode()).hexdigest() for text in ("a", "c")
+    ]
@@ -0,0 +1,93 @@
+"""
+Semantic Response Cache Tests
+
+Checks that cached answers are only reused for the same question:
+1. Identical questions (up to case and punctuation) hit
+2. Near-duplicates with different numbers or literals miss
+3. Close paraphrases with the same literals hit, distant ones miss
+4. Expiry and per-user invalidation
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import semantic_cache
+
+RESPONSE = {"success": True, "answer": "42", "row_count": 1}
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    """Point the cache at a fresh SQLite file for each test"""
+    monkeypatch.setattr(semantic_cache, "CACHE_PATH", tmp_path / "semantic_cache.sqlite")
+    monkeypatch.setattr(semantic_cache, "_conn", None)
+    monkeypatch.setattr(semantic_cache, "MAX_DISTANCE", 0.05)
+    monkeypatch.setattr(semantic_cache, "TTL_SECONDS", 3600)
+    yield semantic_cache
+    if semantic_cache._conn is not None:
+        semantic_cache._conn.close()
+
+
+def test_identical_question_hits(cache):
+    cache.store("u1", "", "What is the total sales?", [1.0, 0.0], RESPONSE)
+    assert cache.lookup("u1", "", "what is  the TOTAL sales", [0.0, 1.0]) == RESPONSE
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("total sales in 2023", "total sales in 2024"),
+    ("top 5 customers", "top 10 customers"),
+    ("top five customers", "top ten customers"),
+    ("orders where status = 'shipped'", "orders where status = 'pending'"),
+])
+def test_different_numbers_or_literals_miss(cache, stored, asked):
+    # Even an identical embedding must not return the other question's answer
+    cache.store("u1", "", stored, [1.0, 0.0], RESPONSE)
+    assert cache.lookup("u1", "", asked, [1.0, 0.0]) is None
+
+
+def test_close_paraphrase_with_same_literals_hits(cache):
+    cache.store("u1", "", "top 5 customers by revenue", [1.0, 0.0], RESPONSE)
+    assert cache.lookup("u1", "", "show the top 5 customers by revenue", [1.0, 0.01]) == RESPONSE
+
+
+def test_distant_paraphrase_misses(cache):
+    cache.store("u1", "", "top 5 customers by revenue", [1.0, 0.0], RESPONSE)
+    assert cache.lookup("u1", "", "top 5 products by revenue", [1.0, 0.5]) is None
+
+
+def test_matching_candidate_found_behind_closer_mismatch(cache):
+    cache.store("u1", "", "sales in 2023", [1.0, 0.0], {"answer": "2023"})
+    cache.store("u1", "", "what were sales in 2024", [1.0, 0.02], {"answer": "2024"})
+    assert cache.lookup("u1", "", "sales in 2024", [1.0, 0.0]) == {"answer": "2024"}
+
+
+def test_scoped_by_user_and_table(cache):
+    cache.store("u1", "orders", "how many orders", [1.0, 0.0], RESPONSE)
+    assert cache.lookup("u2", "orders", "how many orders", [1.0, 0.0]) is None
+    assert cache.lookup("u1", "", "how many orders", [1.0, 0.0]) is None
+
+
+def test_expired_entries_miss(cache, monkeypatch):
+    cache.store("u1", "", "how many orders", [1.0, 0.0], RESPONSE)
+    monkeypatch.setattr(semantic_cache, "TTL_SECONDS", 0)
+    assert cache.lookup("u1", "", "how many orders", [1.0, 0.0]) is None
+
+
+def test_invalidate_user(cache):
+    cache.store("u1", "", "how many orders", [1.0, 0.0], RESPONSE)
+    cache.store("u2", "", "how many orders", [1.0, 0.0], RESPONSE)
+    cache.invalidate_user("u1")
+    assert cache.lookup("u1", "", "how many orders", [1.0, 0.0]) is None
+    assert cache.lookup("u2", "", "how many orders", [1.0, 0.0]) == RESPONSE
+
+
+def test_configure_sets_threshold(cache):
+    cache.configure(max_distance=0.2)
+    assert cache.MAX_DISTANCE == 0.2
+    cache.store("u1", "", "top 5 customers by revenue", [1.0, 0.0], RESPONSE)
+    assert cache.lookup("u1", "", "top 5 products by revenue", [1.0, 0.5]) == RESPONSE
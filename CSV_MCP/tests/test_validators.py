@@ -0,0 +1,80 @@
+"""
+Identifier Validation Tests
+
+Checks the naming rules shared by table creation and the MCP helpers:
+1. User IDs: letters, digits and underscores, at most 40 characters,
+   with a ready-made INVALID_USER_ID response for the MCP tools
+2. Long table names keep the user suffix and stay within 63 characters
+3. Legacy (cut-off) names still match what older versions created
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add this package and CSV_Agent (for core.identifiers) to path
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(package_dir), "CSV_Agent"))
+sys.path.insert(0, package_dir)
+
+from utils.validators import (
+    MAX_IDENT_LENGTH, is_valid_user_id, legacy_table_name, reject_invalid_user, safe_ident, safe_user_id,
+    user_table_name
+)
+
+
+@pytest.mark.parametrize("user_id", ["42", "john_doe", "_x", "A" * 40])
+def test_valid_user_ids(user_id):
+    assert is_valid_user_id(user_id)
+    assert safe_user_id(user_id) == user_id
+
+
+@pytest.mark.parametrize("user_id", ["john-doe", "a.b", "", "a b", "é", "A" * 41, None])
+def test_invalid_user_ids(user_id):
+    assert not is_valid_user_id(user_id)
+    with pytest.raises(ValueError):
+        safe_user_id(user_id)
+
+
+def test_safe_ident_rejects_quotes_and_long_names():
+    assert safe_ident("public") == "public"
+    with pytest.raises(ValueError):
+        safe_ident('pub"lic')
+    with pytest.raises(ValueError):
+        safe_ident("s" * 64)
+
+
+def test_short_name_is_unchanged():
+    assert user_table_name("sales", "42") == "sales_42"
+
+
+def test_long_name_keeps_user_suffix():
+    user_id = "u" * 40
+    name = user_table_name("t" * 100, user_id)
+    assert len(name) <= MAX_IDENT_LENGTH
+    assert name.endswith(f"_{user_id}")
+
+
+def test_distinct_long_names_differ():
+    first = user_table_name("quarterly_sales_report_" + "a" * 60, "john_doe")
+    second = user_table_name("quarterly_sales_report_" + "b" * 60, "john_doe")
+    assert first != second
+
+
+def test_invalid_table_name_rejected():
+    with pytest.raises(ValueError):
+        user_table_name('sales"; DROP TABLE x; --', "42")
+
+
+def test_legacy_name_truncates():
+    long_name = "t" * 100
+    assert legacy_table_name(long_name, "42") == ("t" * 100 + "_42")[:MAX_IDENT_LENGTH]
+    assert legacy_table_name("sales", "42") == user_table_name("sales", "42")
+
+
+def test_reject_invalid_user_builds_tool_error():
+    assert reject_invalid_user("john_doe") is None
+    rejection = reject_invalid_user("john-doe")
+    assert rejection["success"] is False
+    assert rejection["error"] == "INVALID_USER_ID"
@@ -0,0 +1,105 @@
+"""
+Embedding Batcher
+
+Coalesces embedding requests that arrive close together into one model call:
+- Requests are queued from any thread (tool handlers, orchestrator agents)
+- A background thread waits a few milliseconds after the first request,
+  then embeds up to MAX_BATCH_SIZE queued texts in a single forward pass
+- Each caller gets a Future resolved with its own vector
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Sequence
+
+# Seconds to wait for more requests after the first one of a batch
+BATCH_WINDOW_SECONDS = 0.005
+
+# Most texts embedded in one model call
+MAX_BATCH_SIZE = 32
+
+
+class EmbedBatcher:
+    """Batches concurrent embedding requests for one embedding function."""
+
+    def __init__(self, embed_batch_fn: Callable[[List[str]], Sequence[Sequence[float]]],
+                 window: float = BATCH_WINDOW_SECONDS, max_batch: int = MAX_BATCH_SIZE):
+        """
+        Initialize the batcher.
+
+        Args:
+            embed_batch_fn: Function that embeds a list of texts in one call
+            window: Seconds to wait for more requests after the first one
+            max_batch: Most texts per call to embed_batch_fn
+        """
+        self._embed_batch_fn = embed_batch_fn
+        self._window = window
+        self._max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for embedding.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Future resolved with the embedding (await it with asyncio.wrap_future)
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Embed a text, blocking until its batch has been processed.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        return self.submit(text).result()
+
+    def _ensure_worker(self):
+        """Start the background thread on first use."""
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+                    self._worker.start()
+
+    def _next_batch(self) -> list:
+        """Wait for a request, then collect whatever else arrives within the window."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._window
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Embed queued texts batch by batch, forever."""
+        while True:
+            batch = self._next_batch()
+            try:
+                vectors = self._embed_batch_fn([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result([float(x) for x in vector])
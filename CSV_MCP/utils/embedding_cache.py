@@ -0,0 +1,91 @@
+"""
+Embedding Cache
+
+Persistent cache of text embeddings, shared across server processes:
+- SQLite table keyed by the SHA-256 of the text and the model name
+- In-process LRU layer in front of it for repeated queries
+"""
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+# SQLite file holding cached embeddings
+CACHE_PATH = Path(__file__).parent.parent / "cache" / "embeddings.sqlite"
+
+# Embeddings kept in memory per process
+MEMORY_CACHE_SIZE = 1024
+
+_memory: "OrderedDict[tuple, List[float]]" = OrderedDict()
+_lock = threading.Lock()
+_conn = None
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Open the cache database once and make sure its table exists."""
+    global _conn
+    if _conn is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(CACHE_PATH), check_same_thread=False, timeout=30)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(hash TEXT, model TEXT, vec BLOB, PRIMARY KEY (hash, model))"
+        )
+    return _conn
+
+
+def _remember(key: tuple, vec: List[float]):
+    """Add an embedding to the in-process LRU (caller holds _lock)."""
+    _memory[key] = vec
+    _memory.move_to_end(key)
+    if len(_memory) > MEMORY_CACHE_SIZE:
+        _memory.popitem(last=False)
+
+
+def get_or_embed(text: str, model: str, embed_fn: Callable[[str], Sequence[float]]) -> List[float]:
+    """
+    Return the embedding of a text, computing it only on a cache miss.
+
+    Args:
+        text: Text to embed
+        model: Name of the embedding model (part of the cache key)
+        embed_fn: Function that embeds a single text
+
+    Returns:
+        Embedding vector (float32 precision)
+    """
+    key = (hashlib.sha256(text.encode("utf-8")).hexdigest(), model)
+
+    with _lock:
+        vec = _memory.get(key)
+        if vec is not None:
+            _memory.move_to_end(key)
+            return vec
+
+        row = _get_conn().execute(
+            "SELECT vec FROM embeddings WHERE hash = ? AND model = ?", key
+        ).fetchone()
+        if row is not None:
+            vec = array("f", row[0]).tolist()
+            _remember(key, vec)
+            return vec
+
+    # Embed outside the lock; the model call is the slow part
+    packed = array("f", embed_fn(text))
+    vec = packed.tolist()
+
+    with _lock:
+        conn = _get_conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO embeddings (hash, model, vec) VALUES (?, ?, ?)",
+                (*key, packed.tobytes())
+            )
+        _remember(key, vec)
+
+    return vec
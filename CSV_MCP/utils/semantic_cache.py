@@ -0,0 +1,232 @@
+"""
+Semantic Response Cache
+
+Caches query_data responses per user and returns them for later questions
+that are the same question:
+- SQLite table of (user_id, table, query, embedding, response) with a TTL
+- A hit needs the same normalized text, or the same literal tokens (numbers,
+  quoted strings) plus an embedding within a tight cosine distance, so
+  "top 5 customers" never answers "top 10 customers"
+- Cosine distance computed by sqlite-vec when installed, in Python otherwise
+- Invalidated per user when their tables change
+- Responses serialized with orjson when installed (stdlib json otherwise)
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import sqlite_vec
+except ImportError:
+    sqlite_vec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# SQLite file holding cached responses
+CACHE_PATH = Path(__file__).parent.parent / "cache" / "semantic_cache.sqlite"
+
+# Cosine distance below which a question with the same literal tokens reuses
+# a cached response (set from the "semantic_cache" section of config.json)
+MAX_DISTANCE = 0.05
+
+# Seconds a cached response stays valid
+TTL_SECONDS = 3600
+
+# Nearest cached questions checked for matching literal tokens
+CANDIDATES = 5
+
+# Numbers, anything containing a digit (dates, "Q3"), and quoted strings
+_LITERAL_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"|[\w.\-/:]*\d[\w.\-/:]*")
+
+_NUMBER_WORDS = frozenset(
+    "zero one two three four five six seven eight nine ten eleven twelve "
+    "fifteen twenty thirty fifty hundred thousand million first second third last".split()
+)
+
+_lock = threading.Lock()
+_conn = None
+_has_vec = False
+
+
+def configure(max_distance: Optional[float] = None, ttl_seconds: Optional[float] = None):
+    """
+    Override the cache thresholds.
+
+    Args:
+        max_distance: Cosine distance below which near-duplicate questions hit
+        ttl_seconds: Seconds a cached response stays valid
+    """
+    global MAX_DISTANCE, TTL_SECONDS
+    if max_distance is not None:
+        MAX_DISTANCE = float(max_distance)
+    if ttl_seconds is not None:
+        TTL_SECONDS = float(ttl_seconds)
+
+
+def _normalize(text: str) -> str:
+    """Lowercase a question, collapse whitespace and drop trailing punctuation."""
+    return " ".join(text.lower().split()).rstrip("?.! ")
+
+
+def _literal_tokens(text: str) -> Tuple[str, ...]:
+    """Numbers, quoted strings and number words in a question, in order."""
+    lowered = text.lower()
+    tokens = _LITERAL_PATTERN.findall(lowered)
+    tokens += [word for word in re.findall(r"[a-z]+", lowered) if word in _NUMBER_WORDS]
+    return tuple(tokens)
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Open the cache database once, loading sqlite-vec if available."""
+    global _conn, _has_vec
+    if _conn is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(CACHE_PATH), check_same_thread=False, timeout=30)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "id INTEGER PRIMARY KEY, user_id TEXT, table_name TEXT, query_text TEXT, "
+            "query_vec BLOB, response_json TEXT, ts REAL, query_norm TEXT)"
+        )
+        # Cache files written before query_norm existed
+        columns = {row[1] for row in _conn.execute("PRAGMA table_info(responses)")}
+        if "query_norm" not in columns:
+            _conn.execute("ALTER TABLE responses ADD COLUMN query_norm TEXT")
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_user ON responses (user_id, ts)")
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_norm ON responses (user_id, query_norm)")
+        if sqlite_vec is not None:
+            try:
+                _conn.enable_load_extension(True)
+                sqlite_vec.load(_conn)
+                _conn.enable_load_extension(False)
+                _has_vec = True
+            except (AttributeError, sqlite3.Error) as e:
+                print(f"sqlite-vec unavailable, using Python distances: {e}")
+    return _conn
+
+
+def _dumps(response: Dict[str, Any]):
+    """Serialize a response, with orjson when installed (numpy scalars, NaN as null)."""
+    if orjson is not None:
+        return orjson.dumps(response, default=str,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC)
+    return json.dumps(response, default=str)
+
+
+def _loads(data) -> Dict[str, Any]:
+    """Parse a stored response (bytes from orjson or str from json)."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _cosine_distance(a: array, b: array) -> float:
+    """Cosine distance between two vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return 1.0 - dot / norm if norm else 1.0
+
+
+def lookup(user_id: str, table_name: str, query_text: str,
+           query_vec: List[float]) -> Optional[Dict[str, Any]]:
+    """
+    Find a cached response for the same question.
+
+    Args:
+        user_id: User identifier
+        table_name: Table requested with the question ("" for auto-detect)
+        query_text: The question
+        query_vec: Embedding of the question
+
+    Returns:
+        Cached response dictionary, or None on a miss
+    """
+    packed = array("f", query_vec)
+    min_ts = time.time() - TTL_SECONDS
+    literals = _literal_tokens(query_text)
+
+    with _lock:
+        conn = _get_conn()
+
+        # Same question up to case, spacing and trailing punctuation
+        row = conn.execute(
+            "SELECT response_json FROM responses "
+            "WHERE user_id = ? AND query_norm = ? AND table_name = ? AND ts >= ? "
+            "ORDER BY ts DESC LIMIT 1",
+            (user_id, _normalize(query_text), table_name, min_ts)
+        ).fetchone()
+        if row is not None:
+            return _loads(row[0])
+
+        # Otherwise the nearest questions, closest first
+        if _has_vec:
+            candidates = conn.execute(
+                "SELECT response_json, query_text, vec_distance_cosine(query_vec, ?) AS distance "
+                "FROM responses WHERE user_id = ? AND table_name = ? AND ts >= ? "
+                "ORDER BY distance LIMIT ?",
+                (packed.tobytes(), user_id, table_name, min_ts, CANDIDATES)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT response_json, query_text, query_vec FROM responses "
+                "WHERE user_id = ? AND table_name = ? AND ts >= ?",
+                (user_id, table_name, min_ts)
+            ).fetchall()
+            candidates = sorted(
+                ((response, text, _cosine_distance(packed, array("f", vec))) for response, text, vec in rows),
+                key=lambda candidate: candidate[2]
+            )[:CANDIDATES]
+
+    for response, text, distance in candidates:
+        if distance >= MAX_DISTANCE:
+            break
+        # Different numbers or literals make it a different question
+        if _literal_tokens(text) == literals:
+            return _loads(response)
+    return None
+
+
+def store(user_id: str, table_name: str, query_text: str, query_vec: List[float],
+          response: Dict[str, Any]):
+    """
+    Cache a response for a question, dropping expired entries.
+
+    Args:
+        user_id: User identifier
+        table_name: Table requested with the question ("" for auto-detect)
+        query_text: The question
+        query_vec: Embedding of the question
+        response: Response dictionary to return for the same question
+    """
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        with conn:
+            conn.execute("DELETE FROM responses WHERE ts < ?", (now - TTL_SECONDS,))
+            conn.execute(
+                "INSERT INTO responses (user_id, table_name, query_text, query_vec, response_json, ts, query_norm) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user_id, table_name, query_text, array("f", query_vec).tobytes(),
+                 _dumps(response), now, _normalize(query_text))
+            )
+
+
+def invalidate_user(user_id: str):
+    """
+    Drop all cached responses for a user (after their tables change).
+
+    Args:
+        user_id: User identifier
+    """
+    with _lock:
+        conn = _get_conn()
+        with conn:
+            conn.execute("DELETE FROM responses WHERE user_id = ?", (user_id,))
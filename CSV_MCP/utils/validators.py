@@ -0,0 +1,47 @@
+"""
+Identifier Validation
+
+Checks names before they are interpolated into SQL. The rules live in
+CSV_Agent's core.identifiers (on sys.path, see server.py) so tables are
+named the same way when they are created and when they are listed,
+inspected or deleted:
+- safe_ident accepts only plain PostgreSQL identifiers (schemas)
+- safe_user_id accepts letters, digits and underscores, up to 40 characters
+- user_table_name builds a user's table name within PostgreSQL's length limit
+- legacy_table_name gives the cut-off name older versions used
+- reject_invalid_user builds the MCP tools' error response for a bad user ID
+"""
+
+from typing import Any, Dict, Optional
+
+from core.identifiers import (  # noqa: F401
+    MAX_IDENT_LENGTH, MAX_USER_ID_LENGTH, legacy_table_name, safe_ident, safe_user_id, user_table_name
+)
+
+
+def is_valid_user_id(user_id: str) -> bool:
+    """Whether a user ID can be used as a table name suffix."""
+    try:
+        safe_user_id(user_id)
+        return True
+    except ValueError:
+        return False
+
+
+def reject_invalid_user(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Check a user ID for an MCP tool.
+    
+    Args:
+        user_id: User identifier, already stripped
+    
+    Returns:
+        The tool's error response if the user ID is invalid, None otherwise
+    """
+    if is_valid_user_id(user_id):
+        return None
+    return {
+        "success": False,
+        "message": f"User ID may only contain letters, digits and underscores (at most {MAX_USER_ID_LENGTH} characters)",
+        "error": "INVALID_USER_ID"
+    }